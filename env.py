@@ -6,4 +6,10 @@ DATA_DIR = ROOT_DIR / "data"
 DATA_DIR.mkdir(exist_ok=True)
 SOUND_DIR = DATA_DIR / "sound"
 QUESTION_FILE = DATA_DIR / "questions.tsv"
+QUESTION_SHARD_DIR = DATA_DIR / "questions"
+QUESTION_BANK_FILE = DATA_DIR / "questions.qbank"
+QUESTION_DB_FILE = DATA_DIR / "questions.sqlite"
+QUESTION_STATS_FILE = DATA_DIR / "stats.sqlite"
 WINNINGS_FILE = DATA_DIR / "winnings.json"
+ASKED_FILE = DATA_DIR / "asked.bitmap"
+MONITOR_FILE = DATA_DIR / "monitor.json"
@@ -101,16 +101,19 @@ class Milestones:
                 return stages[i]
         return stages[-1]
 
-    def allows_question(self, question: Question, num: int) -> bool:
+    def allowed_levels(self, num: int) -> tuple[QLevel, ...]:
         if self.is_ended(num):
             raise NotImplementedError(f"{num=} is not supposed to be greater than {self.end}")
-        lvl = question.level
-        qualif = self.in_qualif(num)
-        return (lvl == QLevel.EXTREME and qualif
-                or lvl == QLevel.TRIVIAL and not qualif
-                or lvl == QLevel.EASY and self.in_first_stage(num)
-                or lvl == QLevel.MEDIUM and self.in_second_stage(num)
-                or lvl == QLevel.HARD and self.in_last_stage(num))
+        if self.in_qualif(num):
+            return QLevel.EXTREME,
+        if self.in_first_stage(num):
+            return QLevel.TRIVIAL, QLevel.EASY
+        if self.in_second_stage(num):
+            return QLevel.TRIVIAL, QLevel.MEDIUM
+        return QLevel.TRIVIAL, QLevel.HARD
+
+    def allows_question(self, question: Question, num: int) -> bool:
+        return question.level in self.allowed_levels(num)
 
     def allowed_jokers(self, num: int) -> set[Joker]:
         jokers = set(CLASSICAL_JOKERS)
@@ -1,3 +1,31 @@
+import argparse
+from pathlib import Path
+
+from env import MONITOR_FILE
 from millionaire.game import Game
+from millionaire.monitor import LoopMonitor
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-s", "--seed", type=int, help="replay the same game, without recording the questions asked")
+    parser.add_argument("-m", "--monitor", type=Path, nargs="?", const=MONITOR_FILE,
+                        help="record the frame times and the stalls of the windows in a JSON file")
+    parser.add_argument("-p", "--public-process", action="store_true",
+                        help="run the public screen in a process of its own")
+    parser.add_argument("-w", "--web", type=int, nargs="?", const=8000, metavar="PORT",
+                        help="serve the public screen to web browsers")
+    parser.add_argument("--web-host", default="127.0.0.1", help="address to serve the public screen on")
+    parser.add_argument("--stall", type=float, default=50, help="duration of a stall of the windows (ms)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    monitor = None if args.monitor is None else LoopMonitor(args.monitor, threshold=args.stall / 1000)
+    web_screen = None
+    if args.web is not None:
+        from millionaire.display.web import WebPublicScreen
 
-game = Game()
+        web_screen = WebPublicScreen(args.web_host, args.web)
+    game = Game(seed=args.seed, monitor=monitor, public_process=args.public_process, web_screen=web_screen)
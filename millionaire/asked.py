@@ -0,0 +1,153 @@
+"""
+Persistent record of the questions already asked, from show to show.
+
+A question is recorded as one bit of a memory-mapped bitmap, at the position given by its key,
+so that recording it right after it is asked updates a single byte of the file.
+With 2 ** 24 bits (2 MiB), once ten thousand questions are recorded,
+a question is wrongly taken for asked with a probability of about 0.06 %.
+
+With an expiry, the bitmap is split into slots covering a period each, the oldest one being cleared
+when a new period starts, so that a question can be asked again once its slot has expired.
+"""
+
+__all__ = ["AskedBitmap"]
+
+import argparse
+import math
+import mmap
+import struct
+import time
+from pathlib import Path
+
+from env import ASKED_FILE
+
+MAGIC = b"ASKD"
+VERSION = 1
+HEADER = struct.Struct("<4s2HQQ")  # magic, version, number of slots, number of bits per slot, period (s)
+SLOT = struct.Struct("<Q")  # Period number of the slot
+DAY = 86400
+
+
+class AskedBitmap:
+    """Keys of the questions asked, possibly for a limited time."""
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        with open(self._path, "r+b") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0)
+        try:
+            magic, version, self._nslots, self._nbits, self._period = HEADER.unpack_from(self._mmap)
+        except struct.error:
+            magic = version = None
+        if magic != MAGIC or version != VERSION or len(self._mmap) != self._size(self._nslots, self._nbits):
+            self._mmap.close()
+            raise ValueError(f"not a version {VERSION} asked question bitmap: {self._path}")
+        self._start = HEADER.size + SLOT.size * self._nslots
+
+    @staticmethod
+    def _size(nslots: int, nbits: int) -> int:
+        return HEADER.size + (SLOT.size + nbits // 8) * nslots
+
+    @classmethod
+    def create(cls, path: Path, nbits: int = 1 << 24, expiry: float = None, nslots: int = 8):
+        """
+        Creates an empty bitmap, whose questions expire after the given number of days if any,
+        give or take 1 / nslots of it.
+        """
+        if expiry is None:
+            nslots, period = 1, 0
+        else:
+            period = math.ceil(expiry * DAY / nslots)
+        nbits = -(-nbits // 8) * 8
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, nslots, nbits, period))
+            f.truncate(cls._size(nslots, nbits))
+        return cls(path)
+
+    @classmethod
+    def open(cls, path: Path, **kwargs):
+        """Opens the bitmap, creating it with the given arguments if it is missing or invalid."""
+        try:
+            return cls(path)
+        except (FileNotFoundError, ValueError):
+            return cls.create(path, **kwargs)
+
+    @property
+    def expiry(self) -> float | None:
+        """Number of days a question is recorded for, or none if forever."""
+        return self._period * self._nslots / DAY if self._period else None
+
+    def _now(self) -> int:
+        """Current period number."""
+        return int(time.time()) // self._period if self._period else 0
+
+    def _slot_period(self, slot: int) -> int:
+        return SLOT.unpack_from(self._mmap, HEADER.size + SLOT.size * slot)[0]
+
+    def _bit(self, slot: int, key: int) -> tuple[int, int]:
+        """Byte offset and mask of a key in a slot."""
+        bit = key % self._nbits
+        return self._start + slot * (self._nbits // 8) + (bit >> 3), 1 << (bit & 7)
+
+    def __contains__(self, key: int) -> bool:
+        now = self._now()
+        for slot in range(self._nslots):
+            if now - self._slot_period(slot) < self._nslots:
+                offset, mask = self._bit(slot, key)
+                if self._mmap[offset] & mask:
+                    return True
+        return False
+
+    def add(self, key: int):
+        now = self._now()
+        slot = now % self._nslots
+        if self._slot_period(slot) != now:  # Expired: clear it for the current period
+            self._clear(slot)
+            SLOT.pack_into(self._mmap, HEADER.size + SLOT.size * slot, now)
+        offset, mask = self._bit(slot, key)
+        self._mmap[offset] |= mask
+
+    def _clear(self, slot: int):
+        start = self._start + slot * (self._nbits // 8)
+        self._mmap[start:start + self._nbits // 8] = bytes(self._nbits // 8)
+
+    def clear(self):
+        """Forgets all the questions asked."""
+        for slot in range(self._nslots):
+            self._clear(slot)
+
+    def count(self) -> int:
+        """Number of bits set in the slots which did not expire."""
+        now = self._now()
+        n = 0
+        for slot in range(self._nslots):
+            if now - self._slot_period(slot) < self._nslots:
+                start = self._start + slot * (self._nbits // 8)
+                n += int.from_bytes(self._mmap[start:start + self._nbits // 8], "little").bit_count()
+        return n
+
+    def close(self):
+        self._mmap.flush()
+        self._mmap.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="manage the record of the questions already asked")
+    parser.add_argument("-f", "--file", type=Path, default=ASKED_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("count", help="count the questions recorded as asked")
+    reset_parser = commands.add_parser("reset", help="forget all the questions asked, possibly changing the expiry")
+    reset_parser.add_argument("-x", "--expiry", type=float, help="number of days a question is recorded for")
+    reset_parser.add_argument("-b", "--bits", type=int, default=1 << 24, help="size of the bitmap")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "reset":
+        bitmap = AskedBitmap.create(args.file, args.bits, args.expiry)
+    else:
+        bitmap = AskedBitmap.open(args.file)
+    expiry = "forever" if bitmap.expiry is None else f"for {bitmap.expiry:g} days"
+    print(f"{bitmap.count()} questions recorded as asked {expiry}", args.file, sep=": ")
+    bitmap.close()
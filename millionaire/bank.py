@@ -0,0 +1,275 @@
+"""
+Compact on-disk question bank.
+
+All the text cells of the questions are stored in one UTF-8 buffer addressed by an offset array,
+and the levels, publishing dates and row keys as fixed-width arrays.
+The indices of the questions are also stored grouped by language and level, to draw from them without reading them.
+The file is memory-mapped, so that a `Question` is only built when it is picked.
+
+A question file is compiled once into a hidden bank file next to it,
+which is reused as long as the question file does not change.
+"""
+
+__all__ = ["QuestionBank", "open_cached", "load_cached"]
+
+import argparse
+import datetime as dt
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+from pathlib import Path
+
+from env import QUESTION_FILE, QUESTION_BANK_FILE
+from millionaire.question import Question, QLevel, QuestionLoader
+
+MAGIC = b"QBNK"
+VERSION = 5
+HEADER = struct.Struct("<4s3HQQ")  # magic, version, numbers of columns and languages, number of questions, buffer size
+SOURCE = struct.Struct("<QQ32s")  # size, modification time (ns) and SHA-256 digest of the source file
+NO_SOURCE = bytes(SOURCE.size)
+COLUMNS = ("question", "right_answer", "wrong_answer_1", "wrong_answer_2", "wrong_answer_3", "author", "note", "lang")
+ALIGN = 8
+LANG_SIZE = 8
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGN) * ALIGN
+
+
+class QuestionBank(Sequence):
+    """
+    Read-only sequence of questions memory-mapped from a bank file.
+    The questions are attributed to the given shard, if any.
+    """
+
+    def __init__(self, path: Path, shard: str = None):
+        self._path = Path(path)
+        self._shard = shard
+        with open(self._path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        try:
+            magic, version, ncols, nlangs, n, size = HEADER.unpack_from(view)
+            self._source = SOURCE.unpack_from(view, HEADER.size)
+        except struct.error:
+            magic = version = ncols = nlangs = n = size = None
+        if magic != MAGIC or version != VERSION or ncols != len(COLUMNS):
+            view.release()
+            self._mmap.close()
+            raise ValueError(f"not a version {VERSION} question bank: {self._path}")
+        self._n, self._ncols = n, ncols
+
+        layout = {}
+        start = HEADER.size + SOURCE.size
+        for name, fmt, length in [("langs", "B", LANG_SIZE * nlangs), ("counts", "Q", nlangs * len(QLevel)),
+                                  ("order", "I", n), ("levels", "B", n),
+                                  ("dates", "i", n), ("keys", "Q", n), ("offsets", "Q", n * ncols + 1),
+                                  ("buffer", "B", size)]:
+            stop = start + struct.calcsize(fmt) * length
+            layout[name] = fmt, start, stop
+            start = _aligned(stop)
+        if stop != len(view):
+            view.release()
+            self._mmap.close()
+            raise ValueError(f"truncated question bank: {self._path}")
+        sections = {name: view[start:stop].cast(fmt) for name, (fmt, start, stop) in layout.items()}
+        self._views = [view, *sections.values()]
+        self._order, self._levels = sections["order"], sections["levels"]
+        self._dates, self._keys = sections["dates"], sections["keys"]
+        self._offsets, self._buffer = sections["offsets"], sections["buffer"]
+
+        langs = bytes(sections["langs"])
+        self._langs = [langs[i:i + LANG_SIZE].rstrip(b"\0").decode() for i in range(0, len(langs), LANG_SIZE)]
+        self._bounds = {}
+        start = 0
+        counts = iter(sections["counts"])
+        for lang in self._langs:
+            for lvl, count in zip(QLevel, counts):
+                self._bounds[lang, lvl] = start, start + count
+                start += count
+        self._built = {}
+        self._extra = []
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def source(self) -> tuple[int, int, bytes]:
+        """Size, modification time and digest of the question file the bank was compiled from."""
+        return self._source
+
+    def __len__(self) -> int:
+        return self._n + len(self._extra)
+
+    def _cell(self, index: int, column: int) -> str:
+        k = index * self._ncols + column
+        return str(self._buffer[self._offsets[k]:self._offsets[k + 1]], "utf-8")
+
+    def __getitem__(self, index: int) -> Question:
+        """Builds the question once, so that it keeps its state (e.g. shuffled answers) while in game."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("question bank index out of range")
+        if index >= self._n:
+            return self._extra[index - self._n]
+        try:
+            return self._built[index]
+        except KeyError:
+            pass
+        quest, right, *wrongs, author, note, lang = (self._cell(index, c) for c in range(self._ncols))
+        date = dt.date.fromordinal(ordinal) if (ordinal := self._dates[index]) else None
+        self._built[index] = quest = Question(self._levels[index], quest, right, *wrongs,
+                                              author=author, note=note, lang=lang, publishing_date=date,
+                                              shard=self._shard)
+        return quest
+
+    @property
+    def langs(self) -> list[str]:
+        """Languages of the stored questions."""
+        return list(self._langs)
+
+    def level_indices(self, level: QLevel, lang: str = None) -> memoryview | array:
+        """Indices of the stored questions of the given level and language (any by default), without building them."""
+        if lang is None:
+            return array("I", (i for lang in self._langs for i in self.level_indices(level, lang)))
+        try:
+            return self._order[slice(*self._bounds[lang, QLevel(level)])]
+        except KeyError:  # No question in this language
+            return self._order[:0]
+
+    @property
+    def keys(self) -> memoryview:
+        """Keys of the rows the stored questions were parsed from."""
+        return self._keys
+
+    def append(self, question: Question):
+        """Adds a question in memory only, after the stored ones."""
+        self._extra.append(question)
+
+    def close(self):
+        for view in self._views[::-1]:
+            view.release()
+        self._mmap.close()
+
+    @classmethod
+    def write(cls, path: Path, questions: Iterable[Question], source: bytes = NO_SOURCE) -> int:
+        """
+        Writes the questions to a bank file in a single pass and returns their number.
+        The row keys are taken from the questions if they come from a `QuestionLoader`.
+        The file is replaced atomically.
+        """
+        path = Path(path)
+        levels, langs, dates, offsets = array("B"), [], array("i"), array("Q", [0])
+        with tempfile.TemporaryFile() as buffer:
+            size = 0
+            for quest in questions:
+                levels.append(quest.level)
+                langs.append(quest.lang)
+                dates.append(quest.publishing_date.toordinal() if quest.publishing_date else 0)
+                cells = [quest.text, quest.right_answer, *quest.wrong_answers, quest.author, quest.note, quest.lang]
+                if len(cells) != len(COLUMNS):
+                    raise ValueError(f"expected {len(COLUMNS) - 5} wrong answers for question {quest.text!r}")
+                for cell in cells:
+                    size += buffer.write(cell.encode("utf-8"))
+                    offsets.append(size)
+
+            n = len(levels)
+            try:
+                keys = array("Q", questions.keys)
+            except AttributeError:
+                keys = array("Q", bytes(8 * n))
+            groups = {}
+            for i, (lang, level) in enumerate(zip(langs, levels)):
+                if lang not in groups:
+                    groups[lang] = {lvl: [] for lvl in QLevel}
+                groups[lang][level].append(i)
+            order = array("I")
+            counts = array("Q")
+            for inds_by_level in groups.values():
+                for inds in inds_by_level.values():
+                    order.extend(inds)
+                    counts.append(len(inds))
+            lang_table = array("B", b"".join(lang.encode().ljust(LANG_SIZE, b"\0")[:LANG_SIZE] for lang in groups))
+
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, len(COLUMNS), len(groups), n, size))
+                f.write(source)
+                for data in [lang_table, counts, order, levels, dates, keys, offsets]:
+                    f.write(data.tobytes())
+                    f.write(bytes(_aligned(f.tell()) - f.tell()))
+                buffer.seek(0)
+                shutil.copyfileobj(buffer, f)
+            os.replace(tmp_path, path)
+        return n
+
+
+def cache_path(source: Path) -> Path:
+    return source.with_name(f".{source.name}.qbank")
+
+
+def _digest(path: Path) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").digest()
+
+
+def open_cached(source: Path, shard: str = None) -> QuestionBank | None:
+    """
+    Opens the compiled bank of a question file, or returns none if it is missing or outdated.
+    The bank is valid if the size and modification time of the file did not change, or else if its content did not.
+    """
+    path = cache_path(source)
+    stat = source.stat()
+    try:
+        bank = QuestionBank(path, shard)
+    except (FileNotFoundError, ValueError):
+        return None
+    size, mtime, digest = bank.source
+    if (size, mtime) == (stat.st_size, stat.st_mtime_ns):
+        return bank
+    bank.close()
+    if size == stat.st_size and digest == _digest(source):
+        with open(path, "r+b") as f:  # Only touched: refresh the stamp in place
+            f.seek(HEADER.size)
+            f.write(SOURCE.pack(stat.st_size, stat.st_mtime_ns, digest))
+        return QuestionBank(path, shard)
+    return None
+
+
+def load_cached(source: Path, parse: Callable[[], QuestionLoader], shard: str = None) -> QuestionBank:
+    """
+    Opens the compiled bank of a question file, compiling it first if it is missing or outdated.
+    The file must always be parsed in the same way, e.g. with the same default language, as it is not stamped.
+    """
+    if (bank := open_cached(source, shard)) is not None:
+        return bank
+    stat = source.stat()
+    stamp = SOURCE.pack(stat.st_size, stat.st_mtime_ns, _digest(source))
+    QuestionBank.write(cache_path(source), parse(), stamp)
+    return QuestionBank(cache_path(source), shard)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="compile a TSV question file into a question bank file")
+    parser.add_argument("input", nargs="?", type=Path, default=QUESTION_FILE)
+    parser.add_argument("output", nargs="?", type=Path, default=QUESTION_BANK_FILE)
+    parser.add_argument("-e", "--encoding", help="guessed if not given")
+    parser.add_argument("-l", "--lang", default="fr")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    loader = QuestionLoader(args.input, args.lang, args.encoding)
+    n = QuestionBank.write(args.output, loader)
+    print(loader.report())
+    print(f"{n} questions", args.output, sep=": ")
@@ -0,0 +1,145 @@
+"""
+Near-duplicate question detection in large question files.
+
+Each question, with its answers, is reduced to a MinHash signature of its character shingles,
+computed in parallel with one-permutation hashing (a single hash per shingle, spread into bins).
+Signatures are cut into bands, and only the questions sharing a band are compared,
+which scales about linearly with the number of questions.
+"""
+
+__all__ = ["signature", "similarity", "find_duplicates"]
+
+import argparse
+import json
+import multiprocessing
+import operator
+import os
+import re
+import sys
+import unicodedata
+import zlib
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+
+from env import QUESTION_FILE
+from millionaire.question import Question, QuestionLoader
+
+SHINGLE_SIZE = 5
+SIGNATURE_SIZE = 64
+BANDS = 16
+BUCKET_ROUNDS = 8  # Comparisons per member of a band bucket, to stay linear on common shingles
+EMPTY = 0xFFFFFFFF
+
+
+def normalize(text: str) -> str:
+    """Casefolds the text, removes its accents and punctuation."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(re.findall(r"\w+", text))
+
+
+def question_text(quest: Question) -> str:
+    """The question and its answers, whatever their order."""
+    return " ".join([quest.text, quest.right_answer, *sorted(quest.wrong_answers)])
+
+
+def signature(text: str) -> bytes:
+    """MinHash signature of the shingles of the text, by one-permutation hashing."""
+    text = normalize(text)
+    mins = [EMPTY] * SIGNATURE_SIZE
+    for i in range(max(1, len(text) - SHINGLE_SIZE + 1)):
+        h = zlib.crc32(text[i:i + SHINGLE_SIZE].encode()) * 0x9E3779B1 & EMPTY  # Spreads the bits
+        j = h * SIGNATURE_SIZE >> 32
+        if h < mins[j]:
+            mins[j] = h
+    # Densification: empty bins borrow the value of the next non-empty one,
+    # which cannot match the values of another text in their own bin
+    if any(h != EMPTY for h in mins):
+        for j in range(SIGNATURE_SIZE):
+            k = j
+            while mins[k % SIGNATURE_SIZE] == EMPTY:
+                k += 1
+            mins[j] = mins[k % SIGNATURE_SIZE]
+    return array("I", mins).tobytes()
+
+
+def _signatures(texts: list[str]) -> list[bytes]:
+    return [signature(text) for text in texts]
+
+
+def similarity(sig1: Sequence[int], sig2: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the shingles of two texts, given their signatures as integers."""
+    return sum(map(operator.eq, sig1, sig2)) / len(sig1)
+
+
+def _find(parents: dict, i: int) -> int:
+    """Root of the cluster of the index, halving its path."""
+    while (parent := parents.get(i, i)) != i:
+        parents[i] = i = parents.get(parent, parent)
+    return i
+
+
+def find_duplicates(texts: Sequence[str], threshold: float = .7, jobs: int = None,
+                    chunk_size: int = 1024) -> list[list[tuple[int, float]]]:
+    """
+    Clusters the near-duplicate texts.
+    Returns the clusters of indices, each index with its similarity to the first one of its cluster.
+    """
+    chunks = [list(texts[i:i + chunk_size]) for i in range(0, len(texts), chunk_size)]
+    with multiprocessing.Pool(jobs) as pool:
+        sigs = [sig for chunk in pool.imap(_signatures, chunks) for sig in chunk]
+    hashes = [array("I", sig) for sig in sigs]
+
+    parents = {}
+    band_size = SIGNATURE_SIZE // BANDS * 4  # In bytes
+    for band in range(BANDS):
+        buckets = {}
+        for i, sig in enumerate(sigs):
+            buckets.setdefault(sig[band * band_size:(band + 1) * band_size], []).append(i)
+        for bucket in buckets.values():
+            # Joins the members similar to the first one, then repeats with the others
+            for _ in range(BUCKET_ROUNDS):
+                if len(bucket) < 2:
+                    break
+                first, others = bucket[0], []
+                for i in bucket[1:]:
+                    if _find(parents, i) == _find(parents, first):
+                        continue
+                    if similarity(hashes[first], hashes[i]) >= threshold:
+                        parents[_find(parents, i)] = _find(parents, first)
+                    else:
+                        others.append(i)
+                bucket = others
+
+    clusters = {}
+    for i in list(parents):
+        clusters.setdefault(_find(parents, i), set()).add(i)
+    result = []
+    for root, members in clusters.items():
+        members = sorted(members | {root})
+        first = members[0]
+        result.append([(i, similarity(hashes[first], hashes[i])) for i in members])
+    return sorted(result)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="find the near-duplicate questions of a TSV question file")
+    parser.add_argument("input", nargs="?", type=Path, default=QUESTION_FILE)
+    parser.add_argument("-t", "--threshold", type=float, default=.7, help="minimal estimated similarity")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of processes")
+    parser.add_argument("-e", "--encoding", help="guessed if not given")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    loader = QuestionLoader(args.input, encoding=args.encoding)
+    quests = list(loader)
+    print(loader.report(), file=sys.stderr)
+
+    clusters = find_duplicates([question_text(quest) for quest in quests], args.threshold, args.jobs)
+    for n, cluster in enumerate(clusters, 1):
+        members = [dict(line=loader.lines[i], similarity=round(sim, 3), question=quests[i].text) for i, sim in cluster]
+        print(json.dumps(dict(cluster=n, questions=members), ensure_ascii=False))
+    print(f"{len(clusters)} clusters of near-duplicate questions", file=sys.stderr)
@@ -1,4 +1,9 @@
+import tkinter as tk
+import weakref
+from collections.abc import Callable
+
 from millionaire import util, translate
+from millionaire.display.catalog import RenderCatalog
 
 ColorTheme = {
     "base": "deepskyblue3",
@@ -18,9 +23,38 @@ ColorTheme = {
 }
 
 
+class WidgetStates:
+    """
+    Options last applied to each widget, so that a widget is only configured with the options which changed.
+    The widgets given must not be configured otherwise.
+    """
+    ALIASES = {"bg": "background", "fg": "foreground", "bd": "borderwidth"}
+
+    def __init__(self):
+        self._options = weakref.WeakKeyDictionary()  # Forgets the destroyed widgets
+        self.applied = 0
+        self.skipped = 0
+
+    def config(self, widget: tk.Misc, **options):
+        last = self._options.setdefault(widget, {})
+        changed = {}
+        for key, value in options.items():
+            key = self.ALIASES.get(key, key)
+            if key not in last or last[key] != value:
+                changed[key] = value
+        if changed:
+            widget.config(**changed)
+            last.update(changed)
+            self.applied += 1
+        else:
+            self.skipped += 1
+
+
 class MillionaireView:
     def __init__(self, game):
         self._game = game
+        self._translations = []
+        self.widget_states = WidgetStates()
 
     @property
     def game(self):
@@ -33,9 +67,59 @@ class MillionaireView:
             obj = self.game
         return obj.lang
 
+    @property
+    def catalog(self) -> RenderCatalog:
+        return self.game.catalog
+
     def _ts(self, key: str, lang: str = None, icon: bool = False) -> str:
-        """Provides the translation from the resource translation file given the key."""
-        return translate(key, self.lang if lang is None else lang, icon)
+        """Provides the translation from the catalog of the current language, or else the translation file."""
+        if lang is None or lang == self.lang:
+            return self.catalog.icons[key] if icon else self.catalog[key]
+        return translate(key, lang, icon)
 
     def format_num(self, num: int | float, unit: str, lang: str = None):
         return util.format_num(num, unit, self.lang if lang is None else lang)
+
+    def _on_lang(self, text: Callable[[], str], apply: Callable[[str], object]):
+        """Applies a translated text now, and again in place whenever the language changes."""
+        self._translations.append((text, apply))
+        apply(text())
+
+    def _tsvar(self, master: tk.Misc, text: Callable[[], str]) -> tk.StringVar:
+        """Variable holding a translated text, for the `textvariable` option of a widget."""
+        var = tk.StringVar(master)
+        self._on_lang(text, var.set)
+        return var
+
+    @property
+    def counters(self) -> dict[str, int]:
+        """Numbers of widget configurations applied and skipped, reported by the loop monitor."""
+        return dict(configs_applied=self.widget_states.applied, configs_skipped=self.widget_states.skipped)
+
+    def _reconcile(self, widget: tk.Misc, **options):
+        """Configures the widget with the options which changed since the last reconciliation, if any."""
+        self.widget_states.config(widget, **options)
+
+    def retranslate(self):
+        """Updates all the translated texts in the current language."""
+        for text, apply in self._translations:
+            apply(text())
+
+
+class MirroredViews:
+    """
+    Forwards the calls made to a view to several ones, returning the result of the first one.
+    The forwarding function of a method is built on its first call only.
+    """
+
+    def __init__(self, *views):
+        self._views = views
+
+    def __getattr__(self, name: str):
+        methods = [getattr(view, name) for view in self.__dict__["_views"]]
+
+        def call(*args, **kwargs):
+            results = [method(*args, **kwargs) for method in methods]
+            return results[0]
+        self.__dict__[name] = call
+        return call
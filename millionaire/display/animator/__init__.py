@@ -1,8 +1,13 @@
 """
 The animator's hidden terminal.
 """
+import time
+
 from millionaire.display import MillionaireView
 
 
 class AnimationTerminal(MillionaireView):
-    pass
\ No newline at end of file
+    @staticmethod
+    def monotonic() -> float:
+        """Time of the clock the callbacks are scheduled on, in seconds."""
+        return time.monotonic()
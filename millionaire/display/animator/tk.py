@@ -1,5 +1,6 @@
 import re
 import tkinter as tk
+from collections.abc import Callable
 
 from millionaire import Stage, Joker
 from millionaire.display import ColorTheme
@@ -34,51 +35,76 @@ class MillionaireTk(tk.Tk):
 
 
 class TkAnimationTerminal(AnimationTerminal, MillionaireTk):
+    """
+    The pages are built once, then hidden while another one is shown,
+    and their texts are translated in place when the language changes.
+    """
     PAD = 6
+    QUEST_ATTRS = ("_quest", "_quest_btn", "_answs", "_answ_btns", "_auth", "_lvl", "_left", "_pub_date", "_note")
+    ROUND_ATTRS = ("_win_btns", "_joker_btns", "_joker_cmds", "_main_menu_btn")
 
     def __init__(self, game, *args, **kwargs):
         AnimationTerminal.__init__(self, game)
         MillionaireTk.__init__(self, *args, **kwargs)
         self.config(**STYLE)
         self._init_size()
-        self._set_title()
+        self._on_lang(lambda: self._title("app_title"), self.title)
+        self._pages = {}
+        self._page = None
 
     def _init_size(self):
         height = 720
         width = int(4 * height / 3)
         self.minsize(width, height)
 
-    def _set_title(self, widget: tk.Widget = None, ts_key: str = "app_title"):
+    def _title(self, ts_key: str) -> str:
         prefix = "".join(map(self._ts, ["millionaire_short", ":"]))
+        return f'{prefix} {self._ts(ts_key)}'
+
+    def _set_title(self, widget: tk.Widget = None, ts_key: str = "app_title"):
         if widget is None:
             widget = self
-        widget.title(f'{prefix} {self._ts(ts_key)}')
+        widget.title(self._title(ts_key))
 
     def _create_label_frame(self, master: tk.Widget, ts_key: str) -> tk.LabelFrame:
-        return tk.LabelFrame(master, text=self._ts(ts_key), **STYLE)
+        frame = tk.LabelFrame(master, **STYLE)
+        self._on_lang(lambda: self._ts(ts_key), lambda text: frame.config(text=text))
+        return frame
 
     def _create_button(self, master: tk.Widget, command: str, prefix: str = "", suffix: str = "") -> tk.Button:
-        text = prefix + self._ts(command) + suffix
+        textvar = self._tsvar(master, lambda: prefix + self._ts(command) + suffix)
         cmd = getattr(self.game, command)
-        return tk.Button(master, text=text, command=cmd, **BTN_STYLE)
-
-    def _new_page(self, goto_menu: bool = True) -> tk.Frame | tuple[tk.Frame, tk.Button]:
-        self.clear()
-        frame = tk.Frame(self, **STYLE)
-        frame.pack(expand=True)
-        if goto_menu:
-            button = self._create_button(frame, "main_menu")
-            return frame, button
+        return tk.Button(master, textvariable=textvar, command=cmd, **BTN_STYLE)
+
+    def _show_page(self, name: str, build: Callable[[tk.Frame], None], attrs: tuple[str, ...] = ()) -> tk.Frame:
+        """
+        Shows a page, built on its first showing only.
+        The given attributes, set by the build to the widgets of the page, are restored when it is shown again.
+        """
+        try:
+            frame, values = self._pages[name]
+        except KeyError:
+            frame = tk.Frame(self, **STYLE)
+            build(frame)
+            self._pages[name] = frame, {attr: getattr(self, attr) for attr in attrs}
+        else:
+            for attr, value in values.items():
+                setattr(self, attr, value)
+        if self._page is not frame:
+            if self._page is not None:
+                self._page.pack_forget()
+            frame.pack(expand=True)
+            self._page = frame
         return frame
 
     def _create_label(self, master: tk.Widget, ts_key: str, colon: bool = False, **kwargs) -> tk.Label:
-        text = self._ts(ts_key)
-        if colon:
-            text += self._ts(":")
-        return tk.Label(master, text=text)
+        text = lambda: self._ts(ts_key) + (self._ts(":") if colon else "")
+        return tk.Label(master, textvariable=self._tsvar(master, text))
 
     def main_menu(self):
-        frame = self._new_page(False)
+        self._show_page("main_menu", self._build_main_menu)
+
+    def _build_main_menu(self, frame: tk.Frame):
         cmds = [["opening", "closing", "toggle_lang", "restart", "quit"],
                 ["start_qualif", "start_round", "start_free_game"]]
         for column, cmd_row in enumerate(cmds):
@@ -87,17 +113,19 @@ class TkAnimationTerminal(AnimationTerminal, MillionaireTk):
                 button.grid(column=column, row=row, **GRID_STYLE)
 
     def start_qualif(self):
-        frame, goto_menu = self._new_page(True)
+        self._show_page("qualif", self._build_qualif, self.QUEST_ATTRS)
+
+    def _build_qualif(self, frame: tk.Frame):
+        goto_menu = self._create_button(frame, "main_menu")
         quest_frame = self._create_quest_frame(frame)
 
         for i, widget in enumerate([goto_menu, quest_frame]):
             widget.grid(column=0, row=i, **GRID_STYLE)
 
     def _create_winnings_button(self, master: tk.Widget, index: int) -> tk.Button:
-        win_str = self.format_num(self.game.winnings_pyramid[index], self.game.winnings_unit)
-        text = f" {index + 1}. {win_str} "
+        textvar = self._tsvar(master, lambda: f" {index + 1}. {self.catalog.winnings[index]} ")
         cmd = lambda: self.game.set_question_num(index)
-        return tk.Button(master, text=text, command=cmd, **WIN_BTN_STYLE)
+        return tk.Button(master, textvariable=textvar, command=cmd, **WIN_BTN_STYLE)
 
     def _create_winnings_frame(self, master: tk.Widget) -> tk.LabelFrame:
         frame = self._create_label_frame(master, "winnings")
@@ -121,12 +149,14 @@ class TkAnimationTerminal(AnimationTerminal, MillionaireTk):
         return frame
 
     def _create_joker_button(self, master: tk.Widget, joker: Joker) -> tk.Button:
-        return tk.Button(master, text=self._ts(joker, "icon") + " " + self._ts(joker),
-                         command=lambda: self.game.play_joker(joker))
+        textvar = self._tsvar(master, lambda: self.catalog.jokers[joker])
+        return tk.Button(master, textvariable=textvar, command=lambda: self.game.play_joker(joker))
 
     def _create_jokers_frame(self, master: tk.Widget) -> tk.LabelFrame:
         frame = self._create_label_frame(master, "jokers")
         self._joker_btns = {}
+        self._joker_cmds = {joker: (lambda j=joker: self.game.play_joker(j), lambda j=joker: self.game.restore_jokers(j))
+                            for joker in Joker}
         for i, joker in enumerate(Joker):
             button = self._create_joker_button(frame, joker)
             column, row = divmod(i, 3)
@@ -138,14 +168,16 @@ class TkAnimationTerminal(AnimationTerminal, MillionaireTk):
         n = self.game.question_num
         for style, start, stop in [(VALID_STYLE, None, n), (AT_STAKE_STYLE, n, n + 1), (BTN_STYLE, n + 1, None)]:
             for button in self._win_btns[start:stop]:
-                button.config(**style)
+                self._reconcile(button, **style)
 
     def update_jokers(self):
+        available = self.game.available_jokers
         for j, btn in self._joker_btns.items():
-            btn.config(command=lambda j=j: self.game.restore_jokers(j), **BTN_STYLE)
-        for j in self.game.available_jokers:
-            btn = self._joker_btns[j]
-            btn.config(command=lambda j=j: self.game.play_joker(j), **AT_STAKE_STYLE)
+            play, restore = self._joker_cmds[j]
+            if j in available:
+                self._reconcile(btn, command=play, **(BTN_STYLE | AT_STAKE_STYLE))
+            else:
+                self._reconcile(btn, command=restore, **BTN_STYLE)
 
     def _create_quest_widgets(self, master: tk.Widget):
         self._quest = tk.StringVar(master)
@@ -171,18 +203,19 @@ class TkAnimationTerminal(AnimationTerminal, MillionaireTk):
             ("next", AT_STAKE_STYLE, game.next_question, False)
         ]:
             state = tk.DISABLED if disable else tk.NORMAL
-            button = tk.Button(master, text=self._ts(text), command=cmd, state=state, **style)
+            textvar = self._tsvar(master, lambda text=text: self._ts(text))
+            button = tk.Button(master, textvariable=textvar, command=cmd, state=state, **style)
             buttons.append(button)
         return buttons
 
     def _create_quest_frame(self, master: tk.Widget) -> tk.LabelFrame:
         frame = self._create_label_frame(master, "question")
-        author, level, pub_date, note = self._create_quest_metadata(frame)
+        author, level, left, pub_date, note = self._create_quest_metadata(frame)
         self._create_quest_widgets(frame)
         action_btns = self._create_quest_actions(frame)
 
         kws = GRID_STYLE | dict(columnspan=2)
-        for row, widget in enumerate([author, level, pub_date]):
+        for row, widget in enumerate([author, level, left, pub_date]):
             widget.grid(column=0, row=row, **kws)
 
         row += 1
@@ -207,7 +240,7 @@ class TkAnimationTerminal(AnimationTerminal, MillionaireTk):
 
     def _create_quest_metadata(self, master: tk.Widget) -> tuple[tk.Label, ...]:
         labels = []
-        for attr in ["_auth", "_lvl", "_pub_date", "_note"]:
+        for attr in ["_auth", "_lvl", "_left", "_pub_date", "_note"]:
             textvar = tk.StringVar(master)
             label = tk.Label(master, textvariable=textvar, **LABEL_STYLE)
             setattr(self, attr, textvar)
@@ -215,12 +248,15 @@ class TkAnimationTerminal(AnimationTerminal, MillionaireTk):
         return tuple(labels)
 
     def start_round(self):
-        frame, self._main_menu_btn = self._new_page()
-        win_frame = self._create_winnings_frame(frame)
+        self._show_page("round", self._build_round, self.QUEST_ATTRS + self.ROUND_ATTRS)
         self.update_winnings()
+        self.update_jokers()
+
+    def _build_round(self, frame: tk.Frame):
+        self._main_menu_btn = self._create_button(frame, "main_menu")
+        win_frame = self._create_winnings_frame(frame)
         quest_frame = self._create_quest_frame(frame)
         joker_frame = self._create_jokers_frame(frame)
-        self.update_jokers()
 
         self._main_menu_btn.grid(column=0, row=0, **GRID_STYLE)
         kws = GRID_STYLE | dict(columnspan=self._colspan, pady=(self.PAD, 0))
@@ -243,17 +279,24 @@ class TkAnimationTerminal(AnimationTerminal, MillionaireTk):
             return dict(command=lambda: self.game.publish_question(index + 1),
                         state=tk.NORMAL, **UNPUBLISHED_STYLE)
 
-        self._quest.set(quest)
+        self._quest.set(quest.text)
         self._quest_btn.config(**getkws(-1))
         for i, answ in enumerate(quest.mixed_answers):
-            self._answs[i].set(f" ◆ {chr(65 + i)}{self._ts(":")} {answ} ")
+            self._answs[i].set(self._answer_text(i, answ))
             self._answ_btns[i].config(**getkws(i))
 
+    def _answer_text(self, index: int, answer: str) -> str:
+        return f" ◆ {chr(65 + index)}{self._ts(":")} {answer} "
+
     def _load_quest_metadata(self):
-        quest = self.game.question
+        game = self.game
+        quest = game.question
+        left = game.questions_left
+        levels = game.milestones.allowed_levels(game.question_num)
         metadata = [
             ("_auth", "author", quest.author),
             ("_lvl", "level", self._ts(quest.level.name.lower())),
+            ("_left", "questions_left", " · ".join(f"{self._ts(lvl.name.lower())} {left[lvl]}" for lvl in levels)),
             ("_pub_date", "publishing_date", quest.publishing_date),
             ("_note", "note", quest.note),
         ]
@@ -264,6 +307,18 @@ class TkAnimationTerminal(AnimationTerminal, MillionaireTk):
             textvar = getattr(self, attr)
             textvar.set(f"{title} {value}")
 
+    def retranslate(self):
+        AnimationTerminal.retranslate(self)
+        quest = self.game.question
+        try:
+            answs = self._answs
+        except AttributeError:  # No question page built yet
+            return
+        if quest is not None:
+            self._load_quest_metadata()
+            for i, answ in enumerate(quest.mixed_answers):
+                answs[i].set(self._answer_text(i, answ))
+
     def publish_question(self, n_answers: int = -1):
         def getkws(index):
             style = PUBLISHED_STYLE if n_answers > index else UNPUBLISHED_STYLE
@@ -274,7 +329,7 @@ class TkAnimationTerminal(AnimationTerminal, MillionaireTk):
             return dict(command=cmd, state=tk.NORMAL, **style)
 
         quest = self.game.question
-        self._quest.set(quest)
+        self._quest.set(quest.text)
         self._quest_btn.config(**getkws(-1))
         for i in range(len(quest.mixed_answers)):
             self._answ_btns[i].config(**getkws(i))
@@ -0,0 +1,51 @@
+"""
+Texts shown by the views, built once per language.
+"""
+
+__all__ = ["RenderCatalog"]
+
+import sys
+from collections.abc import Sequence
+
+from millionaire import TRANSLATIONS, Joker, QLevel, translate, util
+
+REQUIRED_KEYS = (
+    ":", "millionaire_short", "app_title", "public_screen_title",
+    "opening", "closing", "toggle_lang", "restart", "quit", "start_qualif", "start_round", "start_free_game",
+    "main_menu", "question", "jokers", "classical", "additional", "winnings",
+    "author", "level", "questions_left", "publishing_date", "note", "no_data",
+    "switch_action", "publish", "walk_away", "next", "error", "warning",
+    "QuestionUnderflow", "NoQuestion", "DisabledJoker", "JokersDisabledForQLevel", "NotImplemented",
+    *Joker, *(level.name.lower() for level in QLevel),
+)
+
+
+class RenderCatalog:
+    """
+    Translated labels, joker captions with their icons and formatted winnings of a language.
+    The keys missing from the translations are reported when it is built, and shown as placeholders.
+    """
+
+    def __init__(self, lang: str, winnings_pyramid: Sequence[int | float] = (), winnings_unit: str = ""):
+        self.lang = lang
+        self.labels = {key: ts[lang] for key, ts in TRANSLATIONS.items() if lang in ts}
+        self.icons = {key: ts["icon"] for key, ts in TRANSLATIONS.items() if "icon" in ts}
+        self.missing = sorted({key for key in [*REQUIRED_KEYS, *TRANSLATIONS] if key not in self.labels}
+                              | {f"{joker} (icon)" for joker in Joker if joker not in self.icons})
+        for key in [*REQUIRED_KEYS, *TRANSLATIONS]:
+            self.labels.setdefault(key, translate(key, lang))
+        for joker in Joker:
+            self.icons.setdefault(joker, translate(joker, "icon"))
+        self.jokers = {joker: f"{self.icons[joker]} {self.labels[joker]}" for joker in Joker}
+        self.winnings = tuple(util.format_num(win, winnings_unit, lang) for win in winnings_pyramid)
+        if self.missing:
+            print(f"{lang}: missing translations: {', '.join(self.missing)}", file=sys.stderr)
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            return self.labels[key]
+        except KeyError:  # Not a required key
+            self.missing.append(key)
+            self.labels[key] = text = translate(key, self.lang)
+            print(f"{self.lang}: missing translation: {key}", file=sys.stderr)
+            return text
@@ -0,0 +1,213 @@
+"""
+Views without any display, which record the calls made to them, to script and benchmark games.
+
+The callbacks scheduled by the game, e.g. by its timers, run on a virtual clock advanced at will,
+so that a question timeout takes no time. Where there is no sound card either,
+set the environment variable SDL_AUDIODRIVER to 'dummy'.
+"""
+
+__all__ = ["VirtualClock", "HeadlessAnimationTerminal", "HeadlessPublicScreen"]
+
+import argparse
+import heapq
+import itertools
+import random
+import sys
+import time
+from collections import Counter
+from collections.abc import Callable
+
+from millionaire import QLevel
+from millionaire.display import MillionaireView
+from millionaire.display.animator import AnimationTerminal
+
+
+class VirtualClock:
+    """Clock which only advances when told to, running the callbacks scheduled until then."""
+
+    def __init__(self):
+        self.now = 0.
+        self._queue = []
+        self._ids = itertools.count()
+        self._cancelled = set()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def after(self, ms: int, callback: Callable[[], object]) -> str:
+        id_ = next(self._ids)
+        heapq.heappush(self._queue, (self.now + ms / 1000, id_, callback))
+        return f"after#{id_}"
+
+    def after_cancel(self, id_: str):
+        self._cancelled.add(int(id_.removeprefix("after#")))
+
+    def advance(self, seconds: float = 0.):
+        """Runs the callbacks due until the given number of seconds from now, in order."""
+        end = self.now + seconds
+        while self._queue and self._queue[0][0] <= end:
+            when, id_, callback = heapq.heappop(self._queue)
+            if id_ in self._cancelled:
+                self._cancelled.discard(id_)
+                continue
+            self.now = max(self.now, when)
+            callback()
+        self.now = end
+
+
+class HeadlessView(MillionaireView):
+    """View recording the names and arguments of the calls made to it."""
+    master = None  # The language is the game's
+
+    def __init__(self, game, clock: VirtualClock, record: bool = True):
+        MillionaireView.__init__(self, game)
+        self.clock = clock
+        self.record = record
+        self.calls = []
+        self.counts = Counter()
+
+    def _record(self, name: str, *args):
+        self.counts[name] += 1
+        if self.record:
+            self.calls.append((name, args))
+
+    def retranslate(self):
+        self._record("retranslate")
+
+    def destroy(self):
+        self._record("destroy")
+
+
+class HeadlessAnimationTerminal(AnimationTerminal, HeadlessView):
+    def __init__(self, game, clock: VirtualClock, record: bool = True):
+        HeadlessView.__init__(self, game, clock, record)
+
+    def monotonic(self) -> float:
+        return self.clock()
+
+    def after(self, ms: int, callback: Callable[[], object]) -> str:
+        return self.clock.after(ms, callback)
+
+    def after_cancel(self, id_: str):
+        self.clock.after_cancel(id_)
+
+    def mainloop(self):
+        """Returns at once: the game is driven by its caller."""
+
+    def main_menu(self):
+        self._record("main_menu")
+
+    def start_qualif(self):
+        self._record("start_qualif")
+
+    def start_round(self):
+        self._record("start_round")
+
+    def update_winnings(self):
+        self._record("update_winnings")
+
+    def update_jokers(self):
+        self._record("update_jokers")
+
+    def load_question(self):
+        self._record("load_question", self.game.question)
+
+    def publish_question(self, n_answers: int = -1):
+        self._record("publish_question", n_answers)
+
+    def ask_final_answer(self):
+        self._record("ask_final_answer", self.game.final_answer_index)
+
+    def reveal_answer(self):
+        self._record("reveal_answer", self.game.final_answer_index, self.game.question.right_index)
+
+    def play_joker_fifty(self):
+        self._record("play_joker_fifty", self.game.joker_indices)
+
+    def raise_exc(self, exc: Exception | type):
+        self._record("raise_exc", exc if isinstance(exc, type) else type(exc))
+
+
+class HeadlessPublicScreen(HeadlessView):
+    def __init__(self, game, clock: VirtualClock, record: bool = True):
+        HeadlessView.__init__(self, game, clock, record)
+        self.question_time_progress = self.joker_time_progress = 0.
+
+    def show_question(self, n_answers: int = 4):
+        self._record("show_question", n_answers)
+
+    def show_jokers(self):
+        self._record("show_jokers", self.game.available_jokers)
+
+    def show_winnings(self, final_answer: bool = False):
+        self._record("show_winnings", final_answer)
+
+    def show(self, n_answers: int = 4):
+        self._record("show", n_answers)
+
+    def ask_final_answer(self):
+        self._record("ask_final_answer")
+
+    def reveal_answer(self):
+        self._record("reveal_answer")
+
+    def loss(self):
+        self._record("loss")
+
+    def walk_away(self):
+        self._record("walk_away")
+
+    def update_question_timer(self):
+        self.question_time_progress = self.game.question_time_progress
+        self._record("update_question_timer", self.question_time_progress)
+
+    def update_joker_timer(self):
+        self.joker_time_progress = self.game.joker_time_progress
+        self._record("update_joker_timer", self.joker_time_progress)
+
+
+def play_round(game, rng: random.Random, answer_time: float = 20.) -> int:
+    """
+    Plays a round answering at random, after the given number of seconds of virtual time per question,
+    and returns the number of questions answered right.
+    A trivial question answered right does not count as a step of the pyramid: another one is loaded in its place.
+    """
+    clock = game.animation_terminal.clock
+    game.start_round()
+    right = 0
+    while True:
+        for n_answers in range(5):
+            game.publish_question(n_answers)
+        clock.advance(answer_time)
+        game.ask_final_answer(rng.randrange(len(game.question.mixed_answers)))
+        game.confirm_answer()
+        if not game.question.check_answer(game.final_answer_index):
+            return right
+        right += 1
+        if game.question.level == QLevel.TRIVIAL:
+            game.load_question()
+        elif game.milestones.is_ended(game.question_num + 1):
+            return right
+        else:
+            game.next_question()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="benchmark games played at random without any display")
+    parser.add_argument("-n", "--rounds", type=int, default=1000)
+    parser.add_argument("-s", "--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    from millionaire.game import Game
+
+    args = parse_args()
+    game = Game(seed=args.seed, clock=VirtualClock())
+    game.animation_terminal.record = game.public_screen.record = False
+    rng = random.Random(args.seed)
+    start = time.perf_counter()
+    right = sum(play_round(game, rng) for _ in range(args.rounds))
+    duration = time.perf_counter() - start
+    print(f"{args.rounds} rounds, {right} questions answered right in {duration:.3f} s "
+          f"({args.rounds / duration:.0f} rounds/s)", file=sys.stderr)
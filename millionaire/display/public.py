@@ -2,13 +2,105 @@
 The public display.
 """
 import tkinter as tk
+from functools import lru_cache
 from tkinter import font as tf
 
-from millionaire import Joker, Question
+from millionaire import Joker
 from millionaire.display import MillionaireView, ColorTheme
 from millionaire.question import DUMMY_QUESTION
 
 
+class TextWrapper:
+    """
+    Wraps texts in lines no wider than a number of pixels, measured with the metrics of their font.
+    The widths of the words and the texts wrapped are cached, so that showing a question again is free.
+    """
+    PUNCTUATION = ".,:;?!"  # Kept on the line of the previous word
+
+    def __init__(self, root: tk.Misc, maxsize: int = 256):
+        self._root = root
+        self._fonts = {}
+        self._measure = lru_cache(maxsize=32 * maxsize)(self._measure)
+        self.wrap = lru_cache(maxsize=maxsize)(self.wrap)
+
+    def font(self, font: tuple) -> tf.Font:
+        try:
+            return self._fonts[font]
+        except KeyError:
+            self._fonts[font] = tf.Font(self._root, font=font)
+            return self._fonts[font]
+
+    def _measure(self, word: str, font: tuple) -> int:
+        return self.font(font).measure(word)
+
+    def _break(self, word: str, font: tuple, width: int) -> list[tuple[str, int]]:
+        """Breaks a word into the longest pieces no wider than the width, with their widths."""
+        pieces = []
+        while word:
+            stop = 1
+            while stop < len(word) and self._measure(word[:stop + 1], font) <= width:
+                stop += 1
+            pieces.append((word[:stop], self._measure(word[:stop], font)))
+            word = word[stop:]
+        return pieces
+
+    def wrap(self, text: str, font: tuple, width: int) -> str:
+        """Each line starts with a space, as a margin. A word wider than a line is broken across lines."""
+        words = []
+        for word in text.split():
+            if word in self.PUNCTUATION and words:
+                words[-1] += " " + word
+            else:
+                words.append(word)
+        space = self._measure(" ", font)
+        lines, line, line_width = [], [], space
+        for word in words:
+            word_width = self._measure(word, font)
+            pieces = [(word, word_width)] if space + word_width <= width else self._break(word, font, width - space)
+            for piece, piece_width in pieces:
+                if line and line_width + space + piece_width > width:
+                    lines.append(" " + " ".join(line))
+                    line, line_width = [], space
+                line_width += piece_width + (space if line else 0)
+                line.append(piece)
+        lines.append(" " + " ".join(line))
+        return "\n".join(lines)
+
+
+class TimeBar(tk.Canvas):
+    """
+    Vertical bar filling up with the time elapsed, whose Tk items are only updated
+    when its height in pixels or its colour changes.
+    """
+    LENGTH = 240
+
+    def __init__(self, master: tk.Widget, thickness: int):
+        tk.Canvas.__init__(self, master, width=thickness, height=self.LENGTH, bg=ColorTheme["bg"])
+        fill = 2 ** 16  # Safely large value for filling
+        self._rect = self.create_rectangle(0, fill, fill, fill)
+        self._length = self.winfo_reqheight()
+        self._top = None
+        self._color = None
+        self.redraws = 0
+        self.skipped = 0
+
+    def set_progress(self, progress: float):
+        color = "altbase" if progress < 2 / 3 else "warning" if progress < 1 else "error"
+        top = round((1 - min(max(progress, 0), 1)) * self._length)
+        if top == self._top and color == self._color:
+            self.skipped += 1
+            return
+        if color != self._color:
+            self.itemconfig(self._rect, fill=ColorTheme[color])
+            self._color = color
+        if top != self._top:
+            coords = self.coords(self._rect)
+            coords[1] = top
+            self.coords(self._rect, *coords)
+            self._top = top
+        self.redraws += 1
+
+
 class PublicScreen(MillionaireView, tk.Tk):
     FONT_FAMILY = "Luciole"
     FONT_SIZE_NORMAL = 24
@@ -25,9 +117,12 @@ class PublicScreen(MillionaireView, tk.Tk):
     def __init__(self, game, *args, **kwargs):
         MillionaireView.__init__(self, game)
         tk.Tk.__init__(self, *args, **kwargs)
-        self.title(self._ts("public_screen_title"))
+        self._on_lang(lambda: self._ts("public_screen_title"), self.title)
         self.config(bg=self.DFT_WIDGET_KWS["bg"])
         self.minsize(1280, 720)
+        self._wrapper = TextWrapper(self)
+        font = self.DFT_WIDGET_KWS["font"]
+        self._quest_width = self.QUEST_WRAP_LEN * self._wrapper.font(font).measure("0")  # Tk's average character
         self._init_frames()
 
     @staticmethod
@@ -47,7 +142,9 @@ class PublicScreen(MillionaireView, tk.Tk):
 
     def _create_label_frame(self, text, master: tk.Widget = None, **kwargs) -> tk.LabelFrame:
         mast = self._main_frame if master is None else master
-        return tk.LabelFrame(mast, text=self._ts(text), **(self.DFT_FRAME_KWS | kwargs))
+        frame = tk.LabelFrame(mast, **(self.DFT_FRAME_KWS | kwargs))
+        self._on_lang(lambda: self._ts(text), lambda ts: frame.config(text=ts))
+        return frame
 
     def _create_quest_frame(self):
         frame = self._create_label_frame("question")
@@ -68,35 +165,26 @@ class PublicScreen(MillionaireView, tk.Tk):
             button.grid(column=c, row=1 + r, **self.DFT_GRID_KWS)
             self._answ_btns.append(button)
 
-        self._qtimecv, self._qtimerect = self._create_timebar(expf)
-        self._qtimecv.grid(column=3, row=1, rowspan=2, **self.DFT_GRID_KWS)
+        self._qtimebar = TimeBar(expf, 2 * self.PAD)
+        self._qtimebar.grid(column=3, row=1, rowspan=2, **self.DFT_GRID_KWS)
 
         expf.pack(expand=True)
         return frame
 
-    def _create_timebar(self, master: tk.Widget, vertical: bool = True):
-        width, height = 240, 2 * self.PAD
-        if vertical:
-            width, height = height, width
-        canvas = tk.Canvas(master, width=width, height=height, bg=ColorTheme["bg"])
-        fill = 2 ** 16  # Safely large value for filling
-        rectangle = canvas.create_rectangle(0, fill, fill, fill)
-        return canvas, rectangle
-
-    def _update_timebar(self, canvas: tk.Canvas, rectangle, progress):
-        color = "altbase" if progress < 2 / 3 else "warning" if progress < 1 else "error"
-        coords = canvas.coords(rectangle)
-        coords[1] = (1 - progress) * canvas.winfo_reqheight()
-        canvas.itemconfig(rectangle, fill=ColorTheme[color])
-        canvas.coords(rectangle, *coords)
-
     def update_question_timer(self):
-        progress = self.game.question_time_progress
-        self._update_timebar(self._qtimecv, self._qtimerect, progress)
+        self._qtimebar.set_progress(self.game.question_time_progress)
 
     def update_joker_timer(self):
-        progress = self.game.joker_time_progress
-        self._update_timebar(self._joktimecv, self._joktimerect, progress)
+        self._joktimebar.set_progress(self.game.joker_time_progress)
+
+    @property
+    def counters(self) -> dict[str, int]:
+        """Those of the view, and the numbers of redraws done and skipped by the time bars."""
+        counters = MillionaireView.counters.fget(self)
+        for name, bar in [("question", self._qtimebar), ("joker", self._joktimebar)]:
+            counters[f"{name}_bar_redraws"] = bar.redraws
+            counters[f"{name}_bar_redraws_skipped"] = bar.skipped
+        return counters
 
     def _create_jokers_frame(self):
         frame = self._create_label_frame("jokers")
@@ -109,14 +197,14 @@ class PublicScreen(MillionaireView, tk.Tk):
         kws.update(anchor="w", highlightbackground=ColorTheme["base"], font=(self.FONT_FAMILY, self.FONT_SIZE_JOKERS))
         for i, joker in enumerate(Joker):
             column, row = divmod(i, 3)
-            text = " ".join(["", self._ts(joker, "icon"), self._ts(joker)])
-            button = tk.Button(subwids[column], text=text, **kws)
+            text = lambda joker=joker: " " + self.catalog.jokers[joker]
+            button = tk.Button(subwids[column], textvariable=self._tsvar(subwids[column], text), **kws)
             button.grid(column=0, row=row, **self.DFT_GRID_KWS)
             self._joker_btns[joker] = button
 
-        self._joktimecv, self._joktimerect = self._create_timebar(expf)
+        self._joktimebar = TimeBar(expf, 2 * self.PAD)
 
-        subwids.insert(1, self._joktimecv)
+        subwids.insert(1, self._joktimebar)
         for column, subframe in enumerate(subwids):
             subframe.grid(column=column, row=0, **self.DFT_GRID_KWS)
 
@@ -132,11 +220,8 @@ class PublicScreen(MillionaireView, tk.Tk):
         win_kws = self.DFT_WIDGET_KWS | dict(anchor="w")
         ind_kws["font"] = win_kws["font"] = (self.FONT_FAMILY, self.FONT_SIZE_WINNINGS)
 
-        game = self.game
-        unit = game.winnings_unit
-        pyramid = game.winnings_pyramid
-        row = len(pyramid)
-        for i, win in enumerate(pyramid):
+        row = len(self.catalog.winnings)
+        for i in range(row):
             row -= 1
             ind_kws["highlightbackground"] = win_kws["fg"] = self._win_btn_color(i)
 
@@ -144,7 +229,8 @@ class PublicScreen(MillionaireView, tk.Tk):
             ind_btn.grid(column=0, row=row, **self.DFT_GRID_KWS)
             self._win_btns.append(ind_btn)
 
-            win_btn = tk.Label(expf, text=self.format_num(win, unit), **win_kws)
+            textvar = self._tsvar(expf, lambda i=i: self.catalog.winnings[i])
+            win_btn = tk.Label(expf, textvariable=textvar, **win_kws)
             win_btn.grid(column=1, row=row, **self.DFT_GRID_KWS)
 
         expf.pack(expand=True)
@@ -158,72 +244,58 @@ class PublicScreen(MillionaireView, tk.Tk):
             stage = mstones.stage(index).name.lower()
         return ColorTheme["winnings"][stage]
 
-    @staticmethod
-    def wrap_text(text: str, length: int):
-        lines = []
-        line = ""
-        split = []
-        for word in text.split():
-            if word in ".,:;?!":
-                split[-1] += " " + word
-            else:
-                split.append(word)
-        for word in split:
-            if len(line) + len(word) > length:
-                lines.append(line)
-                line = ""
-            line += " " + word
-        lines.append(line)
-        return "\n".join(lines)
-
     def show_question(self, n_answers: int = 4):
+        self._shown_answs = n_answers
+        n_answers = self._show_texts(n_answers)
+        self._show_answers(n_answers)
+        self.update_question_timer()
+
+    def _show_texts(self, n_answers: int) -> int:
+        """Sets the texts of the question and its answers, returning the number of answers shown."""
         quest = self.game.question
         if quest is None:
             n_answers = 4
             quest = DUMMY_QUESTION[self.lang]
 
-        text = self.wrap_text(quest, self.QUEST_WRAP_LEN) if n_answers >= 0 else ""
+        font = self.DFT_WIDGET_KWS["font"]
+        text = self._wrapper.wrap(quest.text, font, self._quest_width) if n_answers >= 0 else ""
         self._quest.set(text)
-        self._show_answers(quest, n_answers)
-
-        for i in self.game.joker_indices:
-            self._answ_btns[i].config(state=tk.DISABLED)
-
-        self.update_question_timer()
-
-    def _show_answers(self, quest: Question, n_answers: int):
-        kws = self.DFT_WIDGET_KWS.copy()
         for i, answ in enumerate(quest.mixed_answers):
-            if n_answers > i:
-                state = tk.NORMAL
-            else:
-                answ, state = " " * len(answ), tk.ACTIVE
+            if n_answers <= i:
+                answ = " " * len(answ)
             text = f" ◆ {chr(65 + i)}{self._ts(":")} {answ} "
-            text = self.wrap_text(text, self.QUEST_WRAP_LEN // 2)
-            self._answs[i].set(text)
-            kws["highlightbackground"] = ColorTheme["base"]
-            self._answ_btns[i].config(state=state, **kws)
+            self._answs[i].set(self._wrapper.wrap(text, font, self._quest_width // 2))
+        return n_answers
+
+    def _show_answers(self, n_answers: int):
+        kws = self.DFT_WIDGET_KWS | dict(highlightbackground=ColorTheme["base"])
+        disabled = self.game.joker_indices
+        for i, button in enumerate(self._answ_btns):
+            state = tk.NORMAL if n_answers > i else tk.ACTIVE
+            if i in disabled:
+                state = tk.DISABLED
+            self._reconcile(button, state=state, **kws)
 
     def ask_final_answer(self):
-        for button in self._answ_btns:
-            button.config(highlightbackground=ColorTheme["base"])
-        button = self._answ_btns[self.game.final_answer_index]
-        button.config(highlightbackground=ColorTheme["warning"])
+        final = self.game.final_answer_index
+        for i, button in enumerate(self._answ_btns):
+            self._reconcile(button, highlightbackground=ColorTheme["warning" if i == final else "base"])
         self.show_winnings(True)
 
     def reveal_answer(self):
         game = self.game
         colors = {game.final_answer_index: "error", game.question.right_index: "valid"}
         for i, color in colors.items():
-            self._answ_btns[i].config(highlightbackground=ColorTheme[color])
+            self._reconcile(self._answ_btns[i], highlightbackground=ColorTheme[color])
 
     def show_jokers(self):
-        for button in self._joker_btns.values():
-            button.config(state=tk.DISABLED, highlightbackground=ColorTheme["base"])
-        for joker in self.game.available_jokers:
-            self._joker_btns[joker].config(state=tk.NORMAL)
-        for joker in self.game.played_jokers:
-            self._joker_btns[joker].config(state=tk.DISABLED, highlightbackground=ColorTheme["altbase"])
+        available, played = self.game.available_jokers, self.game.played_jokers
+        for joker, button in self._joker_btns.items():
+            if joker in played:
+                state, color = tk.DISABLED, "altbase"
+            else:
+                state, color = tk.NORMAL if joker in available else tk.DISABLED, "base"
+            self._reconcile(button, state=state, highlightbackground=ColorTheme[color])
 
         self.update_joker_timer()
 
@@ -234,7 +306,11 @@ class PublicScreen(MillionaireView, tk.Tk):
                   (self._win_btns[n + 1:], tk.DISABLED, "disabled")]
         for buttons, state, color in config:
             for button in buttons:
-                button.config(state=state, highlightbackground=ColorTheme[color])
+                self._reconcile(button, state=state, highlightbackground=ColorTheme[color])
+
+    def retranslate(self):
+        MillionaireView.retranslate(self)
+        self._show_texts(self._shown_answs)
 
     def show(self, n_answers: int = 4):
         self.show_question(n_answers)
@@ -253,13 +329,13 @@ class PublicScreen(MillionaireView, tk.Tk):
                 color = "error"
             else:
                 color = "base"
-            self._win_btns[i].config(highlightbackground=ColorTheme[color])
+            self._reconcile(button, highlightbackground=ColorTheme[color])
 
     def walk_away(self):
         colors = ["altbase"]
         for button in self._answ_btns:
-            button.config(highlightbackground=ColorTheme[colors[0]])
+            self._reconcile(button, highlightbackground=ColorTheme[colors[0]])
         if (n := self.game.question_num) > 0:
             colors.append("valid")
         for i, color in enumerate(colors):
-            self._win_btns[n - i].config(highlightbackground=ColorTheme[color])
+            self._reconcile(self._win_btns[n - i], highlightbackground=ColorTheme[color])
@@ -0,0 +1,188 @@
+"""
+The public display run in its own process, so that neither window freezes the other.
+
+The game sends the public screen process the calls to make, each with the changes of the state of the game
+it depends on since the previous call: the question, the published answers, the jokers, the winnings,
+and the timers as deadlines on the monotonic clock, which the process animates by itself.
+"""
+
+__all__ = ["RemotePublicScreen"]
+
+import multiprocessing as mp
+from multiprocessing.connection import Connection
+from typing import NamedTuple
+
+from millionaire import LANGS, Milestones
+from millionaire.display.catalog import RenderCatalog
+from millionaire.timer import Timer
+
+POLL_PERIOD = int(1000 / 60)  # ms
+
+
+class PublicQuestion(NamedTuple):
+    """What the public screen shows of a question."""
+    text: str
+    mixed_answers: tuple[str, ...]
+    right_index: int
+
+
+def _get(game, name: str, default=None):
+    try:
+        return getattr(game, name)
+    except AttributeError:  # Not started yet
+        return default
+
+
+def snapshot(game) -> dict:
+    """State of the game shown by the public screen."""
+    quest = game.question
+    return dict(
+        lang=game.lang,
+        question=None if quest is None else PublicQuestion(quest.text, tuple(quest.mixed_answers), quest.right_index),
+        joker_indices=game.joker_indices,
+        available_jokers=tuple(_get(game, "available_jokers", ())),
+        played_jokers=game.played_jokers,
+        question_num=_get(game, "question_num"),
+        final_answer_index=_get(game, "final_answer_index"),
+        safe_net=_get(game, "safe_net"),
+        question_timer=game.question_timer.state,
+        joker_timer=game.joker_timer.state,
+    )
+
+
+class PublicState:
+    """Stand-in of the game in the public screen process, holding the last state received."""
+
+    def __init__(self, milestones: Milestones, winnings_pyramid: tuple, winnings_unit: str, state: dict):
+        self.milestones = milestones
+        self.winnings_pyramid = winnings_pyramid
+        self.winnings_unit = winnings_unit
+        self._state = state
+        self._catalogs = {lang: RenderCatalog(lang, winnings_pyramid, winnings_unit) for lang in LANGS}
+
+    @property
+    def catalog(self) -> RenderCatalog:
+        return self._catalogs[self._state["lang"]]
+
+    def update(self, diff: dict):
+        self._state.update(diff)
+
+    def __getattr__(self, name: str):
+        try:
+            return self.__dict__["_state"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @property
+    def question_time_progress(self) -> float:
+        return Timer.progress_of(self._state["question_timer"])
+
+    @property
+    def joker_time_progress(self) -> float:
+        return Timer.progress_of(self._state["joker_timer"])
+
+    @property
+    def timers_running(self) -> bool:
+        return any(self._state[timer][2] is not None for timer in ["question_timer", "joker_timer"])
+
+
+def _serve(conn: Connection, milestones: Milestones, winnings_pyramid: tuple, winnings_unit: str, state: dict):
+    """Runs the public screen, applying the calls received until the connection is closed."""
+    from millionaire.display.public import PublicScreen
+
+    game = PublicState(milestones, winnings_pyramid, winnings_unit, state)
+    screen = PublicScreen(game)
+
+    def poll():
+        try:
+            while conn.poll():
+                diff, method, args = conn.recv()
+                game.update(diff)
+                if method == "destroy":
+                    screen.destroy()
+                    return
+                getattr(screen, method)(*args)
+        except (EOFError, OSError):  # The game is gone
+            screen.destroy()
+            return
+        if game.timers_running:
+            screen.update_question_timer()
+            screen.update_joker_timer()
+        screen.after(POLL_PERIOD, poll)
+
+    screen.after(POLL_PERIOD, poll)
+    screen.mainloop()
+
+
+class RemotePublicScreen:
+    """Public screen run in a process of its own, with the interface of `PublicScreen`."""
+
+    def __init__(self, game):
+        self._game = game
+        self._state = snapshot(game)
+        self._conn, child = mp.Pipe()
+        ctx = mp.get_context("spawn")  # A fork would share the connection to the display
+        self._process = ctx.Process(target=_serve, name="public-screen", daemon=True,
+                                    args=(child, game.milestones, tuple(game.winnings_pyramid), game.winnings_unit,
+                                          self._state))
+        self._process.start()
+        child.close()
+        self.sent = 0
+
+    @property
+    def game(self):
+        return self._game
+
+    def _call(self, method: str, *args, always: bool = True):
+        """Sends a call with the changes of the state, if any or if the call must be made anyway."""
+        state = snapshot(self._game)
+        diff = {key: value for key, value in state.items() if self._state[key] != value}
+        if not diff and not always:
+            return
+        self._state = state
+        try:
+            self._conn.send((diff, method, args))
+            self.sent += 1
+        except OSError:  # The public screen was closed
+            pass
+
+    def show_question(self, n_answers: int = 4):
+        self._call("show_question", n_answers)
+
+    def show_jokers(self):
+        self._call("show_jokers")
+
+    def show_winnings(self, final_answer: bool = False):
+        self._call("show_winnings", final_answer)
+
+    def show(self, n_answers: int = 4):
+        self._call("show", n_answers)
+
+    def ask_final_answer(self):
+        self._call("ask_final_answer")
+
+    def reveal_answer(self):
+        self._call("reveal_answer")
+
+    def loss(self):
+        self._call("loss")
+
+    def walk_away(self):
+        self._call("walk_away")
+
+    def update_question_timer(self):
+        """Only sent when the timer is started, paused or reset, the process animating it in between."""
+        self._call("update_question_timer", always=False)
+
+    def update_joker_timer(self):
+        self._call("update_joker_timer", always=False)
+
+    def retranslate(self):
+        self._call("retranslate")
+
+    def destroy(self):
+        self._call("destroy")
+        self._conn.close()
+        self._process.join(1)
+        if self._process.is_alive():
+            self._process.terminate()
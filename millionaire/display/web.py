@@ -0,0 +1,293 @@
+"""
+The public display served to web browsers, e.g. for the viewers of a remote game.
+
+A local HTTP server sends every viewer the state shown by the public screen as a Server-Sent Events stream:
+the whole state when it connects, then the entries which changed, each encoded once for all the viewers.
+The timers are sent when started, paused or reset only, with their elapsed time, and animated by the browsers.
+"""
+
+__all__ = ["WebPublicScreen"]
+
+import asyncio
+import json
+import threading
+import time
+
+from millionaire import Joker
+from millionaire.display import MillionaireView, ColorTheme
+from millionaire.question import DUMMY_QUESTION
+
+MAX_BUFFER = 1 << 16  # Bytes waiting to be sent to a viewer, beyond which it is disconnected
+TIMERS = ("question_timer", "joker_timer")
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title></title>
+<style>
+body { background: %(bg)s; color: %(fg)s; font-family: Luciole, sans-serif; margin: 2em; }
+fieldset { border: 2px solid %(fg)s; margin-bottom: 1em; }
+#main { display: grid; grid-template-columns: 3fr 1fr; gap: 1em; }
+#question { font-size: 1.6em; text-align: center; margin: .5em; }
+#answers { display: grid; grid-template-columns: 1fr 1fr; gap: .5em; }
+.box { border: 3px solid; padding: .4em; min-height: 1.2em; }
+.disabled { opacity: .3; }
+.bar { width: 100%%; height: .8em; background: #222; margin-top: .5em; }
+.bar div { height: 100%%; width: 0; }
+#winnings div { display: flex; justify-content: space-between; }
+</style>
+</head>
+<body>
+<div id="main">
+<div>
+<fieldset><legend id="label-question"></legend>
+<div id="question"></div><div id="answers"></div><div class="bar"><div id="question_timer"></div></div>
+</fieldset>
+<fieldset><legend id="label-jokers"></legend>
+<div id="jokers"></div><div class="bar"><div id="joker_timer"></div></div>
+</fieldset>
+</div>
+<fieldset><legend id="label-winnings"></legend><div id="winnings"></div></fieldset>
+</div>
+<script>
+const colors = %(colors)s;
+let state = {};
+const $ = id => document.getElementById(id);
+const esc = text => text.replace(/[&<>]/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;"})[c]);
+
+function received(data) {
+  const diff = JSON.parse(data);
+  for (const timer of %(timers)s) {
+    if (diff[timer]) diff[timer].at = performance.now();
+  }
+  Object.assign(state, diff);
+  render();
+}
+
+function render() {
+  document.title = state.title;
+  for (const [key, label] of Object.entries(state.labels)) $("label-" + key).textContent = label;
+  $("question").textContent = state.question;
+  $("answers").innerHTML = state.answers.map((answer, i) =>
+    `<div class="box${state.disabled_answers.includes(i) ? " disabled" : ""}"
+      style="border-color: ${colors[state.answer_marks[i]]}">${esc(answer)}</div>`).join("");
+  $("jokers").innerHTML = state.jokers.map(([caption, status]) =>
+    `<span class="box${status === "available" ? "" : " disabled"}"
+      style="border-color: ${colors[status === "played" ? "altbase" : "base"]}">${esc(caption)}</span>`).join(" ");
+  $("winnings").innerHTML = state.winnings.map((amount, i) =>
+    `<div class="box" style="color: ${state.winnings_colors[i]};
+      border-color: ${state.winnings_marks[i] ? colors[state.winnings_marks[i]] : state.winnings_colors[i]}">
+      <span>${i + 1}</span><span>${esc(amount)}</span></div>`).reverse().join("");
+}
+
+function animate() {
+  for (const timer of %(timers)s) {
+    const t = state[timer];
+    if (!t) continue;
+    const elapsed = t.elapsed + (t.running ? (performance.now() - t.at) / 1000 : 0);
+    const progress = t.timeout ? Math.min(elapsed / t.timeout, 1) : 0;
+    const bar = $(timer);
+    bar.style.width = `${100 * progress}%%`;
+    bar.style.background = colors[progress < 2 / 3 ? "altbase" : progress < 1 ? "warning" : "error"];
+  }
+  requestAnimationFrame(animate);
+}
+
+const events = new EventSource("/events");
+events.addEventListener("state", event => { state = {}; received(event.data); });
+events.addEventListener("diff", event => received(event.data));
+requestAnimationFrame(animate);
+</script>
+</body>
+</html>
+"""
+
+
+def _encode(event: str, view: dict) -> bytes:
+    """Server-Sent Event of a state, with the timers as their elapsed time now."""
+    data = dict(view)
+    for timer in TIMERS:
+        if timer in data:
+            timeout, elapsed, since = data[timer]
+            if since is not None:
+                elapsed += time.monotonic() - since
+            data[timer] = dict(timeout=timeout, elapsed=elapsed, running=since is not None)
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
+
+class WebPublicScreen(MillionaireView):
+    """Public screen served to any number of web browsers, with the interface of `PublicScreen`."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8000):
+        MillionaireView.__init__(self, None)
+        self.address = host, port
+        self._state = {}  # Last state published, in the game thread
+        self._view = {}  # Last state sent, in the server thread
+        self._clients = set()
+        self._n_answers = 4
+        self._answer_marks = ["base"] * 4
+        self._winnings_marks = []
+        self._loop = asyncio.new_event_loop()
+        self._page = PAGE % dict(bg=ColorTheme["bg"], fg=ColorTheme["fg"], timers=json.dumps(TIMERS),
+                                 colors=json.dumps({k: v for k, v in ColorTheme.items() if isinstance(v, str)}))
+        server = asyncio.start_server(self._handle, host, port)
+        self._server = self._loop.run_until_complete(server)  # Fails here if the address is in use
+        threading.Thread(target=self._loop.run_forever, name="web-public-screen", daemon=True).start()
+
+    @property
+    def lang(self) -> str:
+        return self.game.lang
+
+    @property
+    def viewers(self) -> int:
+        return len(self._clients)
+
+    def attach(self, game):
+        """Shows the given game, e.g. a new one after a restart."""
+        self._game = game
+        self._n_answers = 4
+        self._answers_base()
+        self._winnings_marks = [None] * len(game.winnings_pyramid)
+        self._publish(self._render())
+
+    def _render(self) -> dict:
+        game = self.game
+        quest = game.question
+        n_answers = self._n_answers
+        if quest is None:
+            n_answers = 4
+            quest = DUMMY_QUESTION[self.lang]
+        try:
+            available = game.available_jokers
+        except AttributeError:  # Not started yet
+            available = ()
+        played = game.played_jokers
+        mstones = game.milestones
+        return dict(
+            title=self._ts("public_screen_title"),
+            labels={key: self._ts(key) for key in ["question", "jokers", "winnings"]},
+            question=quest.text if n_answers >= 0 else "",
+            answers=[f"◆ {chr(65 + i)}{self._ts(":")} {answ}" if n_answers > i else ""
+                     for i, answ in enumerate(quest.mixed_answers)],
+            answer_marks=list(self._answer_marks),
+            disabled_answers=list(game.joker_indices),
+            jokers=[(self.catalog.jokers[joker],
+                     "played" if joker in played else "available" if joker in available else "disabled")
+                    for joker in Joker],
+            winnings=list(self.catalog.winnings),
+            winnings_colors=[ColorTheme["winnings"]["safe_net" if i in mstones.safe_nets
+                                                    else mstones.stage(i).name.lower()]
+                             for i in range(len(game.winnings_pyramid))],
+            winnings_marks=list(self._winnings_marks),
+            question_timer=game.question_timer.state,
+            joker_timer=game.joker_timer.state,
+        )
+
+    def _publish(self, view: dict):
+        """Sends the entries of the view which changed, if any."""
+        diff = {key: value for key, value in view.items() if self._state.get(key) != value}
+        if diff:
+            self._state.update(diff)
+            self._loop.call_soon_threadsafe(self._broadcast, diff)
+
+    def _broadcast(self, diff: dict):
+        self._view.update(diff)
+        data = _encode("diff", diff)
+        for writer in list(self._clients):
+            if writer.transport.get_write_buffer_size() > MAX_BUFFER:  # Too slow: let it reconnect
+                self._clients.discard(writer)
+                writer.close()
+            else:
+                writer.write(data)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            path = request.split(b"\r\n", 1)[0].split(b" ")[1]
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, IndexError):
+            writer.close()
+            return
+        if path == b"/events":
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n\r\n")
+            writer.write(_encode("state", self._view))
+            self._clients.add(writer)
+            try:
+                await reader.read()  # Until the viewer leaves
+            except ConnectionError:
+                pass
+            self._clients.discard(writer)
+        elif path == b"/":
+            body = self._page.encode()
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                         b"Content-Length: %d\r\nConnection: close\r\n\r\n" % len(body) + body)
+        else:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+        writer.close()
+
+    def show_question(self, n_answers: int = 4):
+        self._n_answers = n_answers
+        self._answers_base()
+        self._publish(self._render())
+
+    def _answers_base(self):
+        self._answer_marks = ["base"] * 4
+
+    def _mark_winnings(self, final_answer: bool = False):
+        n = self.game.question_num
+        self._winnings_marks[:n] = ["valid"] * len(self._winnings_marks[:n])
+        self._winnings_marks[n:n + 1] = ["warning" if final_answer else "base"] * len(self._winnings_marks[n:n + 1])
+        self._winnings_marks[n + 1:] = ["disabled"] * len(self._winnings_marks[n + 1:])
+
+    def show_jokers(self):
+        self._publish(self._render())
+
+    def show_winnings(self, final_answer: bool = False):
+        self._mark_winnings(final_answer)
+        self._publish(self._render())
+
+    def show(self, n_answers: int = 4):
+        self._n_answers = n_answers
+        self._answers_base()
+        self._mark_winnings()
+        self._publish(self._render())
+
+    def ask_final_answer(self):
+        self._answers_base()
+        self._answer_marks[self.game.final_answer_index] = "warning"
+        self.show_winnings(True)
+
+    def reveal_answer(self):
+        game = self.game
+        self._answer_marks[game.final_answer_index] = "error"
+        self._answer_marks[game.question.right_index] = "valid"
+        self._publish(self._render())
+
+    def loss(self):
+        current = self.game.question_num
+        safe = self.game.safe_net
+        if safe is None:
+            safe = -1
+        for i in range(current + 1):
+            self._winnings_marks[i] = "valid" if i <= safe else "error" if i == current else "base"
+        self._publish(self._render())
+
+    def walk_away(self):
+        self._answer_marks = ["altbase"] * 4
+        n = self.game.question_num
+        self._winnings_marks[n] = "altbase"
+        if n > 0:
+            self._winnings_marks[n - 1] = "valid"
+        self._publish(self._render())
+
+    def update_question_timer(self):
+        self._publish(dict(question_timer=self.game.question_timer.state))
+
+    def update_joker_timer(self):
+        self._publish(dict(joker_timer=self.game.joker_timer.state))
+
+    def retranslate(self):
+        self._publish(self._render())
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._server.close)
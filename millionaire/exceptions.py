@@ -14,6 +14,16 @@ class QuestionNumberError(QuestionError):
     pass
 
 
+class NoQuestionError(QuestionError):
+    pass
+
+
+class QuestionFormatError(QuestionError):
+    def __init__(self, msg: str, line: int = None):
+        super().__init__(msg if line is None else f"line {line}: {msg}")
+        self.line = line
+
+
 class JokerError(MillionaireError):
     pass
 
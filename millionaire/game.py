@@ -4,34 +4,83 @@ Mixes the model with the controller in the MVC design pattern.
 """
 
 import csv
+import sqlite3
 import sys
 import time
+from functools import partial
 
-from env import QUESTION_FILE, WINNINGS_FILE
+from env import (QUESTION_FILE, QUESTION_SHARD_DIR, QUESTION_BANK_FILE, QUESTION_DB_FILE, QUESTION_STATS_FILE,
+                 WINNINGS_FILE, ASKED_FILE)
 from millionaire import *
 from millionaire import QLevel
+from millionaire.asked import AskedBitmap
+from millionaire.bank import QuestionBank, load_cached
 from millionaire.display.animator.tk import TkAnimationTerminal
+from millionaire.display import MirroredViews
+from millionaire.display.catalog import RenderCatalog
 from millionaire.display.public import PublicScreen
 from millionaire.exceptions import (
     PerformanceError,
+    NoQuestionError,
     QuestionUnderflowWarning,
     DisabledJokerError,
     JokersDisabledForQLevelError
 )
-from millionaire.question import Question
+from millionaire.monitor import LoopMonitor
+from millionaire.question import NEUTRAL_LANG, Question, QuestionLoader
+from millionaire.sampling import WeightedPool
+from millionaire.shards import ShardedQuestionBank
 from millionaire.sound import SoundPlayer
+from millionaire.stats import QuestionStats
+from millionaire.store import QuestionStore
+from millionaire.timer import TickScheduler, Timer
+from millionaire.watch import QuestionFileWatcher
 
 
 class Game:
     def __init__(self, lang: str = "fr",
                  milestones: Milestones = Milestones.twelve_balanced(),
-                 question_timeout: int = 180):
+                 question_timeout: int = 180,
+                 question_filters: dict = None,
+                 question_shards: list[str] = None,
+                 seed: int = None,
+                 monitor: LoopMonitor = None,
+                 public_process: bool = False,
+                 web_screen: "WebPublicScreen" = None,
+                 clock: "VirtualClock" = None):
+        """
+        The question filters select a subset of the SQLite question store, if any:
+        see the keyword arguments of `QuestionStore`.
+        The question shards are the names of the files of the question directory to play with, if any (all by default):
+        see `ShardedQuestionBank`.
+        With a seed, the game is a rehearsal: the question order, answer orders and 50:50 eliminations are replayed
+        identically, and the questions asked are not recorded for the next games.
+        The monitor, if any, records the timing of the event loop of the windows.
+        The public screen may run in a process of its own, e.g. on a core of its own for a second monitor.
+        It is mirrored to the web browsers of the viewers by the web screen, if any.
+        With a virtual clock, the game runs without any display, driven by its caller: see `millionaire.display.headless`.
+        """
+        self._seed = seed
+        self._rng = random.Random(seed)
+        self._monitor = monitor
+        self._public_process = public_process
+        self._web_screen = web_screen
+        self._clock = clock
         self._lang = lang
         self.milestones = milestones
         self.question_timeout = question_timeout
+        self._qfilters = question_filters or {}
+        self._qshards = question_shards
+        self._ticks = TickScheduler(lambda ms, callback: self.animation_terminal.after(ms, callback),
+                                    self.REFRESH_RATE if clock is None else None,
+                                    lambda: self.animation_terminal.monotonic())
+        self._qtimer = Timer(self._ticks, lambda: self.public_screen.update_question_timer(), self._quest_timeout)
+        self._joktimer = Timer(self._ticks, lambda: self.public_screen.update_joker_timer(), self._qtimer.resume)
 
         self.init_question_data()
         self._init_winnings()
+        if web_screen is not None:
+            web_screen.attach(self)
         self._soundp = SoundPlayer(self)
         self._init_display()
         self.main_menu()
@@ -45,37 +94,148 @@ class Game:
             if lang == self.lang:
                 self._lang = LANGS[(i + 1) % len(LANGS)]
                 break
-        self._init_display()
+        self._select_qtoask()
+        self.animation_terminal.retranslate()
+        self.public_screen.retranslate()
+
+    def _parse_qdata(self) -> QuestionLoader:
+        self._qloader = QuestionLoader(QUESTION_FILE, NEUTRAL_LANG)
+        return self._qloader
 
-    def _parse_qdata(self, encoding: str = "utf-8"):
-        with open(QUESTION_FILE, newline='', encoding=encoding, errors='replace') as f:
-            reader = csv.reader(f, dialect=csv.excel_tab)
-            for row in reader:
-                row = [cell.encode(encoding).decode("utf-8") for cell in row]
-                level = row[5]
-                kws = {}
-                for i, name in enumerate(["author", "note", "publishing_date"]):
-                    try:
-                        value = row[6 + i]
-                    except IndexError:
-                        value = None
-                    kws[name] = value
-                quest = Question(level, row[0], row[1], *row[2:5], lang=self.lang, **kws)
-                self._qdata.append(quest)
+    def _qlevel_indices(self, level: QLevel, lang: str):
+        try:
+            return self._qdata.level_indices(level, lang)
+        except AttributeError:
+            return [i for i, quest in enumerate(self._qdata) if quest.level == level and quest.lang == lang]
+
+    def _qweight(self, index: int) -> float:
+        return self._qstats.weight(self._qdata[index].key)
+
+    def _init_qpartitions(self, exclude: set[int] = frozenset()):
+        """Pools the indices of the questions to ask per language (or none) and level."""
+        self._qpartitions = {}
+        for lang in [*LANGS, NEUTRAL_LANG]:
+            self._qpartitions[lang] = {}
+            for lvl in QLevel:
+                if hasattr(self._qdata, "pool"):  # Drawn by the backend itself, e.g. in SQL
+                    self._qpartitions[lang][lvl] = self._qdata.pool(lvl, lang, self._qweight, self._rng, exclude)
+                    continue
+                indices = self._qlevel_indices(lvl, lang)
+                if exclude:
+                    indices = (i for i in indices if i not in exclude)
+                self._qpartitions[lang][lvl] = WeightedPool(indices, self._qweight, self._rng)
+        self._select_qtoask()
+
+    def _select_qtoask(self):
+        """Asks the questions of the current language and the neutral ones, or else those of any language."""
+        self._qtoask = {lang: self._qpartitions[lang] for lang in [self.lang, NEUTRAL_LANG]}
+        if not any(pool for partition in self._qtoask.values() for pool in partition.values()):
+            self._qtoask = self._qpartitions
 
     def init_question_data(self):
-        self._qdata = []
-        for encoding in ["utf-8", "utf-16", "latin-1"]:
+        start = time.perf_counter()
+        try:
+            self._qdata.close()
+        except AttributeError:
+            pass
+        self._qloader = self._qwatcher = None
+        if QUESTION_DB_FILE.exists():
+            self._qdata = QuestionStore(QUESTION_DB_FILE, **self._qfilters)
+        elif QUESTION_BANK_FILE.exists():
+            self._qdata = QuestionBank(QUESTION_BANK_FILE)
+        elif any(QUESTION_SHARD_DIR.rglob("*.tsv")):
+            self._qdata = self._qwatcher = ShardedQuestionBank(QUESTION_SHARD_DIR, self._qshards)
+            for report in self._qdata.reports:
+                print(report, file=sys.stderr)
+        else:
             try:
-                self._parse_qdata(encoding)
-            except UnicodeError:
-                pass
-        n = len(self._qdata)
-        if n > (thres := 65536):  # 2 ** 16 questions; empirically set
-            raise PerformanceError(f"too many questions (> {thres})")
-        self._qtoask = random.sample(range(n), n)
+                self._qdata = load_cached(QUESTION_FILE, self._parse_qdata)
+                self._qwatcher = QuestionFileWatcher(QUESTION_FILE, NEUTRAL_LANG, self._qdata.keys, self._qdata.source)
+            except PermissionError:  # Read-only data directory: keep the questions in memory
+                self._qdata = list(self._parse_qdata())
+                if len(self._qdata) > (thres := 65536):  # 2 ** 16 questions; empirically set
+                    raise PerformanceError(f"too many questions (> {thres}); compile them with 'python -m millionaire.bank'")
+                self._qwatcher = QuestionFileWatcher(QUESTION_FILE, NEUTRAL_LANG, self._qloader.keys)
+        try:
+            self._qstats.close()
+        except AttributeError:
+            pass
+        try:
+            self._qstats = QuestionStats(QUESTION_STATS_FILE if self._seed is None else ":memory:")
+        except sqlite3.Error:  # Read-only data directory
+            self._qstats = QuestionStats(":memory:")
+        self._init_qpartitions()
         self._qpicked = []
         self._qasked = []
+        self._qskipped = []
+        self._qexhausted = set()  # Languages and levels whose questions were all asked: no longer skipped
+        self._qremoved = set()
+        try:
+            self._asked.close()
+        except AttributeError:
+            pass
+        try:
+            self._asked = AskedBitmap.open(ASKED_FILE) if self._seed is None else set()
+        except OSError:  # Read-only data directory: only remember the questions of this game
+            self._asked = set()
+        if self._qloader is not None:
+            print(self._qloader.report(), file=sys.stderr)
+        print(f"{len(self._qdata)} questions loaded in {time.perf_counter() - start:.3f} s", file=sys.stderr)
+
+    QDATA_WATCH_PERIOD = 2000  # ms
+
+    def _watch_qdata(self):
+        """Merges the questions added to or changed in the question file since the last check."""
+        try:
+            changes = self._qwatcher.poll()
+        except AttributeError:  # Not watching a question file
+            return
+        except (OSError, csv.Error) as e:  # The file is being written: retry later
+            print(e, file=sys.stderr)
+        else:
+            if changes is not None:
+                self._merge_qdata(*changes)
+                print(self._qwatcher.report(), file=sys.stderr)
+        self.animation_terminal.after(self.QDATA_WATCH_PERIOD, self._watch_qdata)
+
+    def _merge_qdata(self, added: list[Question], removed: list[int]):
+        """
+        Adds the new questions at random places in the questions to ask
+        and withdraws the removed ones, apart from those already picked.
+        """
+        for quest in added:
+            i = len(self._qdata)
+            self._qdata.append(quest)
+            if quest.lang not in self._qpartitions or not self._qenabled(i):
+                continue
+            self._qpartitions[quest.lang][quest.level].add(i)
+            self._qexhausted.discard((quest.lang, quest.level))
+        for i in removed:
+            self._qremoved.add(i)
+            quest = self._qdata[i]
+            try:
+                self._qpartitions[quest.lang][quest.level].discard(i)
+            except KeyError:  # Not a language of the game
+                pass
+
+    def _qenabled(self, index: int) -> bool:
+        try:
+            return self._qdata.is_enabled(index)
+        except AttributeError:  # Not sharded
+            return True
+
+    @property
+    def question_shards(self) -> list[str]:
+        try:
+            return self._qdata.shards
+        except AttributeError:
+            return []
+
+    def enable_question_shard(self, shard: str, enabled: bool = True):
+        """Adds the questions of a shard to those to ask, or withdraws them, without loading any question again."""
+        self._qdata.enable(shard, enabled)
+        self._qshards = sorted(self._qdata.enabled_shards)
+        self._init_qpartitions(self._qremoved.union(self._qpicked, self._qskipped))
 
     def _init_winnings(self):
         self._wins = []
@@ -84,6 +244,7 @@ class Game:
         data = data[self.lang]
         self._wins = data["pyramid"][str(self.milestones.end)]
         self._win_unit = data["unit"]
+        self._catalogs = {lang: RenderCatalog(lang, self._wins, self._win_unit) for lang in LANGS}
 
     @property
     def winnings_pyramid(self):
@@ -93,14 +254,40 @@ class Game:
     def winnings_unit(self):
         return self._win_unit
 
+    @property
+    def catalog(self) -> RenderCatalog:
+        """Texts of the views in the current language."""
+        return self._catalogs[self.lang]
+
     def _init_display(self):
-        for attr, cls in [("_anim_term", TkAnimationTerminal), ("_pub_screen", PublicScreen)]:
+        if self._clock is not None:
+            from millionaire.display.headless import HeadlessAnimationTerminal, HeadlessPublicScreen
+
+            views = [("_anim_term", partial(HeadlessAnimationTerminal, clock=self._clock)),
+                     ("_pub_screen", partial(HeadlessPublicScreen, clock=self._clock))]
+        elif self._public_process:
+            from millionaire.display.remote import RemotePublicScreen
+
+            views = [("_anim_term", TkAnimationTerminal), ("_pub_screen", RemotePublicScreen)]
+        else:
+            views = [("_anim_term", TkAnimationTerminal), ("_pub_screen", PublicScreen)]
+        for attr, cls in views:
             try:
                 getattr(self, attr).destroy()
             except AttributeError:
                 pass
             setattr(self, attr, cls(self))
+        if self._web_screen is None:
+            self._public_screen = self._pub_screen
+        else:
+            self._public_screen = MirroredViews(self._pub_screen, self._web_screen)
         self.main_menu()
+        self._watch_qdata()
+        self._ticks.rearm()
+        if self._monitor is not None:
+            self._monitor.attach(self._anim_term, "animation_terminal")
+            if not self._public_process:
+                self._monitor.attach(self._pub_screen, "public_screen")
         self._anim_term.mainloop()
 
     @property
@@ -108,8 +295,9 @@ class Game:
         return self._anim_term
 
     @property
-    def public_screen(self) -> PublicScreen:
-        return self._pub_screen
+    def public_screen(self) -> "PublicScreen | RemotePublicScreen | MirroredViews":
+        """The public screen, mirrored to the web screen if any, built along with the views."""
+        return self._public_screen
 
     def opening(self):
         self.sound_player.credits(True)
@@ -119,7 +307,9 @@ class Game:
 
     def restart(self):
         self.sound_player.stop()
-        self.__init__(self.lang, self.milestones, self._qtimeout)
+        self.__init__(self.lang, self.milestones, self._qtimeout, self._qfilters, self._qshards, self._seed,
+                      self._monitor, self._public_process, self._web_screen,
+                      self._clock)
 
     def quit(self):
         sys.exit()
@@ -199,26 +389,68 @@ class Game:
         except IndexError:
             return None
 
-    def _qpick(self):
-        self._qpicked.append(self._qtoask.pop())
-
-    def _restack_qtoask(self):
-        self._qtoask.extend(self._qpicked)
-        random.shuffle(self._qtoask)
+    @property
+    def questions_left(self) -> dict[QLevel, int]:
+        """Number of questions left to pick per level, in the current language."""
+        return {lvl: sum(len(partition[lvl]) for partition in self._qtoask.values()) for lvl in QLevel}
+
+    def _qpick(self, skip_asked: bool = True):
+        """
+        Picks among the questions allowed at the current question number, weighted by their statistics,
+        skipping those already asked in previous games unless told otherwise, or unless all those of their level were.
+        """
+        while True:
+            groups = [(lang, lvl) for lang, partition in self._qtoask.items()
+                      for lvl in self.milestones.allowed_levels(self._qnum) if partition[lvl]]
+            if not groups:
+                raise IndexError("no more questions to pick")
+            group, = self._rng.choices(groups, [self._qtoask[lang][lvl].mass for lang, lvl in groups])
+            lang, lvl = group
+            pool = self._qtoask[lang][lvl]
+            i = pool.propose()
+            if skip_asked and group not in self._qexhausted and self._qdata[i].key in self._asked:
+                pool.take(i)
+                self._qskipped.append(i)
+            elif pool.accept(i):
+                pool.take(i)
+                self._qpicked.append(i)
+                return
+
+    def _restack_qtoask(self, skipped: bool = False):
+        """Puts the picked questions back in the questions to ask, and the skipped ones too if told so."""
+        if skipped:
+            self._qpicked += self._qskipped
+            self._qskipped = []
+        for i in self._qpicked:
+            if i in self._qremoved:
+                continue
+            quest = self._qdata[i]
+            try:
+                self._qpartitions[quest.lang][quest.level].put_back(i)
+            except KeyError:  # Not a language of the game
+                pass
         self._qpicked = []
 
     def load_question(self):
-        self._run_qtimer = False
-        self._pub_answs = -1
         try:
             self._qpick()
-            while not self.milestones.allows_question(self.question, self._qnum):
-                self._qpick()
-        except IndexError:  # No more questions to pick
+        except IndexError:  # No more questions to pick: ask them again, but the current one
+            self._qexhausted.update((lang, lvl) for lang in self._qtoask
+                                    for lvl in self.milestones.allowed_levels(self._qnum))
+            current = self._qpicked[-1:]
+            del self._qpicked[-1:]
+            self._restack_qtoask(skipped=True)
+            self._qpicked = current
+            try:
+                self._qpick(skip_asked=False)
+            except IndexError:  # No question at all for this question number: leave the current one as it is
+                self.animation_terminal.raise_exc(NoQuestionError)
+                return
             self.animation_terminal.raise_exc(QuestionUnderflowWarning)
-            self._restack_qtoask()
+        self._qtimer.pause()
+        self._pub_answs = -1
         self._joker_fifty_ind = None
-        self.question.shuffle()
+        self.question.shuffle(self._rng)
         self.animation_terminal.load_question()
 
     def publish_question(self, n_answers: int = None):
@@ -227,42 +459,46 @@ class Game:
         if self.in_qualif and n_answers > 0:
             n_answers = 4
         self._pub_answs = max(-1, min(n_answers, 4))
+        if self._pub_answs >= 0:
+            self._record_asked()
 
         self._reset_joker_timer()
-        if n_answers > 0 and not self._run_qtimer:
-            self._start_quest_timer()
-        else:
-            self._qcountup = 0
+        if n_answers > 0 and not self._qtimer.running:
+            self._qtimer.start(self.question_timeout)
+        elif not self._qtimer.running:
+            self._qtimer.reset()
 
         self.animation_terminal.publish_question(self._pub_answs)
         self.public_screen.show(self._pub_answs)
         if not self.sound_player.is_playing_question_stage(self.stage):
             self.sound_player.question()
 
+    def _record_asked(self):
+        """Records the current question as asked, once shown to the public."""
+        i = self._qpicked[-1]
+        if not self._qasked or self._qasked[-1] != i:
+            self._qasked.append(i)
+            self._asked.add(self.question.key)
+            self._qstats.record_asked(self.question.key)
+
+    def forget_asked_questions(self):
+        """Allows all the questions to be asked again in this game and the next ones."""
+        self._asked.clear()
+        self._qexhausted.clear()
+
     REFRESH_RATE = int(1000 / 30)
 
-    def _start_quest_timer(self, restart: bool = True):
-        if restart:
-            self._run_qtimer = True
-            self._qtimestart = time.time()
-        if self._run_qtimer:
-            self._qcountup = time.time() - self._qtimestart
-            self.public_screen.update_question_timer()
-            if self._qcountup >= self.question_timeout:
-                if not self.in_qualif:
-                    self.sound_player.reveal_qualif()
-                self.public_screen.update_question_timer()
-                self._run_qtimer = False
-            else:
-                repeat = lambda: self._start_quest_timer(False)
-                self.animation_terminal.after(self.REFRESH_RATE, repeat)
+    def _quest_timeout(self):
+        if not self.in_qualif:
+            self.sound_player.reveal_qualif()
 
     @property
     def question_time_progress(self) -> float:
-        try:
-            return self._qcountup / self.question_timeout
-        except AttributeError:
-            return 0
+        return self._qtimer.progress
+
+    @property
+    def question_timer(self) -> Timer:
+        return self._qtimer
 
     def ask_final_answer(self, index: int):
         self._final_answ_ind = index
@@ -286,10 +522,11 @@ class Game:
             self.public_screen.loss()
 
     def confirm_answer(self):
-        self._run_qtimer = False
+        self._qtimer.pause()
         self.display_reveal_answer()
+        right = self.question.check_answer(self.final_answer_index)
+        self._qstats.record_answer(self.question.key, right)
         if self.question.level != QLevel.TRIVIAL:
-            right = self.question.check_answer(self.final_answer_index)
             next_ends = self.milestones.is_ended(self.question_num + 1)
             if self.in_qualif or right or next_ends:
                 self.sound_player.win()
@@ -313,7 +550,7 @@ class Game:
     def _play_joker_fifty(self):
         wrong_inds = self.question.wrong_indices()
         half = (len(wrong_inds) + 1) // 2
-        self._joker_fifty_ind = random.sample(wrong_inds, half)
+        self._joker_fifty_ind = self._rng.sample(wrong_inds, half)
         self.animation_terminal.play_joker_fifty()
         self.public_screen.show_question()
 
@@ -335,7 +572,8 @@ class Game:
                     case Joker.FIFTY:
                         self._play_joker_fifty()
                     case Joker.FRIEND:
-                        self._start_joker_timer()
+                        self._qtimer.pause()
+                        self._joktimer.start(self.joker_timeout)
                     case Joker.SWITCH:
                         self.load_question()
                 self.animation_terminal.update_jokers()
@@ -348,39 +586,16 @@ class Game:
     def joker_timeout(self):
         return 30
 
-    def _start_joker_timer(self, restart: bool = True):
-        if restart:
-            self._run_qtimer = False
-            self._run_joktimer = True
-            self._joktimestart = time.time()
-        if self._run_joktimer:
-            self._jokcountup = time.time() - self._joktimestart
-            self.public_screen.update_joker_timer()
-            if self._jokcountup >= self.joker_timeout:
-                self._run_joktimer = False
-                self.public_screen.update_joker_timer()
-                try:
-                    self._qtimestart += self._jokcountup
-                except AttributeError:
-                    self._qtimestart = time.time()
-                self._jokcountup = 0
-                self._run_qtimer = True
-                self._start_quest_timer(False)
-            else:
-                repeat = lambda: self._start_joker_timer(False)
-                self.animation_terminal.after(self.REFRESH_RATE, repeat)
-
     def _reset_joker_timer(self):
-        self._run_joktimer = False
-        self._jokcountup = 0
-        self.public_screen.update_joker_timer()
+        self._joktimer.reset()
 
     @property
     def joker_time_progress(self) -> float:
-        try:
-            return self._jokcountup / self.joker_timeout
-        except AttributeError:
-            return 0
+        return self._joktimer.progress
+
+    @property
+    def joker_timer(self) -> Timer:
+        return self._joktimer
 
     @property
     def played_jokers(self) -> tuple:
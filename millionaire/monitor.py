@@ -0,0 +1,95 @@
+"""
+Monitoring of the Tk event loop, to find out what makes the screens hitch during a show.
+
+A tick is scheduled on every window at a short period, and the real interval between two ticks is recorded
+in a histogram per window. A watchdog thread captures the stack of the main thread whenever no tick came
+for longer than a threshold, i.e. when the event loop is stalled, and the stall is recorded with that stack.
+The results are written as JSON when the program exits, with the counters of the windows which have some.
+"""
+
+__all__ = ["LoopMonitor"]
+
+import atexit
+import json
+import sys
+import threading
+import time
+import tkinter as tk
+import traceback
+from pathlib import Path
+
+BINS = (5, 10, 20, 33, 50, 100, 200, 500, 1000)  # Upper bounds of the frame time histogram bins (ms)
+
+
+class LoopMonitor:
+    """Frame time histograms of Tk windows, and stacks of the event loop stalls."""
+
+    def __init__(self, path: Path, period: int = 10, threshold: float = .05):
+        """The period of the ticks is in milliseconds, the threshold of the stalls in seconds."""
+        self._path = Path(path)
+        self._period = period
+        self._threshold = threshold
+        self._start = time.monotonic()
+        self._histograms = {}
+        self._max = {}
+        self._beats = {}  # Monotonic time of the last tick of each window
+        self._windows = {}
+        self._stack = None  # Stack captured during the current stall
+        self.stalls = []
+        self._lock = threading.Lock()
+        self._main = threading.main_thread().ident
+        threading.Thread(target=self._watch, name="loop-monitor", daemon=True).start()
+        atexit.register(self.dump)
+
+    def attach(self, root: tk.Misc, name: str):
+        """Starts ticking on a window, replacing the one of the same name, if any."""
+        self._histograms.setdefault(name, [0] * (len(BINS) + 1))
+        self._max.setdefault(name, 0.)
+        self._beats[name] = time.monotonic()
+        self._windows[name] = root
+        root.after(self._period, lambda: self._tick(root, name))
+
+    def _tick(self, root: tk.Misc, name: str):
+        now = time.monotonic()
+        with self._lock:
+            interval = now - self._beats[name]
+            self._beats[name] = now
+            stack, self._stack = self._stack, None
+        ms = 1000 * interval
+        bins = self._histograms[name]
+        bins[next((i for i, bound in enumerate(BINS) if ms <= bound), len(BINS))] += 1
+        self._max[name] = max(self._max[name], ms)
+        if interval - self._period / 1000 > self._threshold:
+            self.stalls.append(dict(window=name, at=round(now - self._start - interval, 3),
+                                    ms=round(ms, 1), stack=stack))
+        try:
+            root.after(self._period, lambda: self._tick(root, name))
+        except tk.TclError:  # Destroyed
+            pass
+
+    def _watch(self):
+        while True:
+            time.sleep(self._threshold / 4)
+            with self._lock:
+                if self._stack is not None or not self._beats:
+                    continue
+                if time.monotonic() - max(self._beats.values()) > self._threshold + self._period / 1000:
+                    frame = sys._current_frames().get(self._main)
+                    if frame is not None:
+                        self._stack = traceback.format_stack(frame)
+
+    def report(self) -> dict:
+        windows = {}
+        for name, bins in self._histograms.items():
+            bounds = [f"<={bound}" for bound in BINS] + [f">{BINS[-1]}"]
+            windows[name] = dict(frames=sum(bins), max_ms=round(self._max[name], 1), histogram=dict(zip(bounds, bins)))
+            try:
+                windows[name]["counters"] = dict(self._windows[name].counters)
+            except AttributeError:  # No counters
+                pass
+        return dict(period_ms=self._period, threshold_ms=1000 * self._threshold, windows=windows, stalls=self.stalls)
+
+    def dump(self):
+        with open(self._path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        print(f"{len(self.stalls)} event loop stalls", self._path, sep=": ", file=sys.stderr)
@@ -1,6 +1,21 @@
+import codecs
+import csv
 import datetime as dt
+import functools
+import hashlib
+import io
+import itertools
 import random
+import sys
+import time
+from array import array
+from collections.abc import Iterable, Iterator
 from enum import IntEnum
+from pathlib import Path
+
+from millionaire.exceptions import QuestionFormatError
+
+NEUTRAL_LANG = ""  # Language of the questions asked whatever the language of the game
 
 
 class QLevel(IntEnum):
@@ -15,16 +30,39 @@ class QLevel(IntEnum):
         return cls(int(value))
 
 
-class Question(str):
-    def __new__(cls, level: QLevel | int | str,
-                question: str,
-                right_answer: str,
-                *wrong_answers: str,
-                author: str = None,
-                note: str = None,
-                lang: str = "fr",
-                publishing_date: str | dt.date = None):
-        return super().__new__(cls, question)
+@functools.cache
+def _shuffles(n: int) -> tuple[tuple[tuple[int, ...], int, tuple[int, ...]], ...]:
+    """
+    All the orders of n answers, the right one being 0,
+    with the mixed index of the right answer and those of the wrong ones.
+    """
+    shuffles = []
+    for order in itertools.permutations(range(n)):
+        right = order.index(0)
+        shuffles.append((order, right, tuple(i for i in range(n) if i != right)))
+    return tuple(shuffles)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_date(value: str) -> dt.date:
+    """Parses a date written year first or day first, separated by dashes, slashes or dots."""
+    for sep in "-/.":
+        for codes in ["Ymd", "dmY"]:
+            try:
+                fmt = sep.join(f"%{c}" for c in codes)
+                return dt.datetime.strptime(value, fmt).date()
+            except ValueError:
+                pass
+    raise ValueError(f"unknown date format for {value!r}")
+
+
+class Question:
+    """
+    A question with its answers and metadata.
+    Slotted, with interned authors and languages, and the order of the mixed answers stored as a permutation number,
+    since thousands of them are held in memory.
+    """
+    __slots__ = ("_text", "_lvl", "_answs", "_auth", "_note", "_lang", "_pub_date", "_shard", "_perm")
 
     def __init__(self, level: QLevel | int | str,
                  question: str,
@@ -33,27 +71,57 @@ class Question(str):
                  author: str = None,
                  note: str = None,
                  lang: str = "fr",
-                 publishing_date: str | dt.date = None):
+                 publishing_date: str | dt.date = None,
+                 shard: str = None):
+        """The shard is the name of the question file the question comes from, if the questions are sharded."""
+        self._text = str(question)
         self._lvl = QLevel.from_str(level) if isinstance(level, str) else QLevel(level)
-        self._right_answ = str(right_answer)
-        self._wrong_answs = tuple(map(str, wrong_answers))
-        self._auth = str(author) if author else ""
+        self._answs = (str(right_answer), *map(str, wrong_answers))
+        self._auth = sys.intern(str(author)) if author else ""
         self._note = str(note) if note else ""
-        self._lang = lang
+        self._lang = sys.intern(lang)
         self.publishing_date = publishing_date
+        self._shard = sys.intern(shard) if shard else ""
         self.shuffle()
 
+    def __str__(self) -> str:
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._lvl.name}, {self._text!r})"
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def key(self) -> int:
+        """64-bit hash of the question and its answers, which identifies it whatever its metadata."""
+        return row_key([self._text, *self._answs])
+
+    @classmethod
+    def from_row(cls, row: list[str], lang: str = "fr", shard: str = None):
+        """
+        Builds a question from a row of the question file:
+        question, right answer, three wrong answers, level, then optionally author, note, publishing date and language.
+        The language of the row defaults to that of the file, which may be neutral.
+        """
+        kws = dict(zip(["author", "note", "publishing_date"], row[6:9]))
+        if len(row) > 9 and row[9]:
+            lang = row[9]
+        return cls(row[5], row[0], row[1], *row[2:5], lang=lang, shard=shard, **kws)
+
     @property
     def level(self) -> QLevel:
         return self._lvl
 
     @property
     def right_answer(self) -> str:
-        return self._right_answ
+        return self._answs[0]
 
     @property
     def wrong_answers(self) -> tuple[str, ...]:
-        return self._wrong_answs
+        return self._answs[1:]
 
     @property
     def author(self) -> str:
@@ -63,6 +131,14 @@ class Question(str):
     def note(self) -> str:
         return self._note
 
+    @property
+    def lang(self) -> str:
+        return self._lang
+
+    @property
+    def shard(self) -> str:
+        return self._shard
+
     @property
     def publishing_date(self) -> dt.date:
         return self._pub_date
@@ -72,46 +148,144 @@ class Question(str):
         if not value:
             self._pub_date = None
         elif isinstance(value, str):
-            for sep in "-/.":
-                for codes in ["Ymd", "dmY"]:
-                    try:
-                        fmt = sep.join(f"%{c}" for c in codes)
-                        self._pub_date = dt.datetime.strptime(value, fmt).date()
-                        return
-                    except ValueError:
-                        pass
-            raise ValueError(f"unknown date format for {value!r}")
+            self._pub_date = parse_date(value)
         else:
             self._pub_date = value
 
-    def shuffle(self, seed: int = None):
-        answers = [self._right_answ, *self._wrong_answs]
-        random.seed(seed)
-        random.shuffle(answers)
-        self._mixed_answs = tuple(answers)
+    def shuffle(self, rng: random.Random = random):
+        self._perm = rng.randrange(len(_shuffles(len(self._answs))))
 
     @property
     def mixed_answers(self) -> tuple[str]:
-        return self._mixed_answs
+        order, _, _ = _shuffles(len(self._answs))[self._perm]
+        return tuple(self._answs[i] for i in order)
 
     @property
     def right_index(self) -> int:
-        for i, answ in enumerate(self._mixed_answs):
-            if answ == self._right_answ:
-                return i
+        return _shuffles(len(self._answs))[self._perm][1]
 
     def wrong_indices(self) -> tuple[int]:
-        inds = []
-        for i, answ in enumerate(self._mixed_answs):
-            if answ != self._right_answ:
-                inds.append(i)
-        return inds
+        return _shuffles(len(self._answs))[self._perm][2]
 
     def check_answer(self, index: int) -> bool:
         """
         Returns true if the index is that of the right answer.
         """
-        return self._mixed_answs[index] == self._right_answ
+        return index == self.right_index
+
+
+def memory_footprint(questions: Iterable[Question]) -> float:
+    """Average number of bytes held per question, counting shared objects (e.g. interned strings) once."""
+    seen = {id(lvl) for lvl in QLevel}
+    size = n = 0
+    for quest in questions:
+        n += 1
+        stack = [quest, *(getattr(quest, attr) for attr in Question.__slots__)]
+        while stack:
+            obj = stack.pop()
+            if id(obj) not in seen:
+                seen.add(id(obj))
+                size += sys.getsizeof(obj)
+                if isinstance(obj, tuple):
+                    stack.extend(obj)
+    return size / n if n else 0.
+
+
+BOMS = [(codecs.BOM_UTF8, "utf-8-sig", "utf-8"),
+        (codecs.BOM_UTF32_LE, "utf-32", "utf-32-le"), (codecs.BOM_UTF32_BE, "utf-32", "utf-32-be"),
+        (codecs.BOM_UTF16_LE, "utf-16", "utf-16-le"), (codecs.BOM_UTF16_BE, "utf-16", "utf-16-be")]
+
+
+def sniff_encoding(path: Path, size: int = 65536) -> str:
+    """Guesses the encoding of a text file from its BOM or else from its first bytes."""
+    with open(path, "rb") as f:
+        prefix = f.read(size)
+    for bom, encoding, _ in BOMS:
+        if prefix.startswith(bom):
+            return encoding
+    if b"\0" in prefix:  # Mostly ASCII text encoded on two bytes
+        return "utf-16-be" if prefix[::2].count(0) > prefix[1::2].count(0) else "utf-16-le"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(prefix, final=len(prefix) < size)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def row_key(row: list[str]) -> int:
+    """64-bit hash of the cells of a row, to recognize unchanged rows without parsing them."""
+    digest = hashlib.blake2b("\x1f".join(row).encode("utf-8", "surrogatepass"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class QuestionLoader:
+    """
+    Reads the questions of a TSV file in a single pass, possibly from a byte offset.
+    Invalid rows are skipped and their errors kept with their line number.
+    """
+
+    def __init__(self, path: Path, lang: str = "fr", encoding: str = None, start: int = 0, first_line: int = 1,
+                 shard: str = None):
+        self.path = Path(path)
+        self.lang = lang
+        self.shard = shard
+        self.encoding = sniff_encoding(self.path) if encoding is None else encoding
+        self.start = start
+        self.first_line = first_line
+        self.errors: list[QuestionFormatError] = []
+        self.keys = array("Q")
+        self.lines = array("L")
+        self.count = 0
+        self.duration = 0.
+
+    def _open(self) -> io.TextIOWrapper:
+        f = open(self.path, "rb")
+        encoding = self.encoding
+        if self.start:
+            head = f.read(4)
+            for bom, with_bom, without_bom in BOMS:
+                if head.startswith(bom) and encoding == with_bom:
+                    encoding = without_bom
+                    break
+            f.seek(self.start)
+        return io.TextIOWrapper(f, encoding=encoding, errors='replace', newline='')
+
+    def rows(self) -> Iterator[tuple[int, list[str]]]:
+        """Non-empty rows with the number of their first line."""
+        with self._open() as f:
+            reader = csv.reader(f, dialect=csv.excel_tab)
+            line = self.first_line
+            for row in reader:
+                if any(row):
+                    yield line, row
+                line = self.first_line + reader.line_num
+
+    def parse(self, line: int, row: list[str]) -> Question | None:
+        """Builds the question of a row, or records its error."""
+        try:
+            quest = Question.from_row(row, self.lang, self.shard)
+        except IndexError:
+            self.errors.append(QuestionFormatError(f"expected at least 6 columns, got {len(row)}", line))
+        except ValueError as e:
+            self.errors.append(QuestionFormatError(str(e), line))
+        else:
+            self.keys.append(row_key(row))
+            self.lines.append(line)
+            self.count += 1
+            return quest
+
+    def __iter__(self) -> Iterator[Question]:
+        start = time.perf_counter()
+        for line, row in self.rows():
+            if (quest := self.parse(line, row)) is not None:
+                yield quest
+        self.duration = time.perf_counter() - start
+
+    def report(self) -> str:
+        lines = [f"{self.path}: {error}" for error in self.errors]
+        lines.append(f"{self.path}: {self.count} questions parsed ({self.encoding}), "
+                     f"{len(self.errors)} invalid rows skipped, in {self.duration:.3f} s")
+        return "\n".join(lines)
 
 
 DUMMY_QUESTION = {
@@ -0,0 +1,186 @@
+"""
+Random draws of the questions to ask.
+"""
+
+__all__ = ["AliasTable", "WeightedPool"]
+
+import math
+import random
+from array import array
+from collections.abc import Callable, Iterable, Sequence
+
+
+class AliasTable:
+    """Walker's alias table: draws an index with a probability proportional to its weight, in constant time."""
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        self.total = math.fsum(weights)
+        self._prob = array("d", bytes(8 * n))
+        self._alias = array("I", bytes(4 * n))
+        scaled = [w * n / self.total for w in weights] if self.total else [1.] * n
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self._prob[s], self._alias[s] = scaled[s], l
+            scaled[l] -= 1 - scaled[s]
+            (small if scaled[l] < 1 else large).append(l)
+        for i in small + large:  # Left by rounding errors
+            self._prob[i] = 1.
+
+    def __len__(self) -> int:
+        return len(self._prob)
+
+    def draw(self, rng: random.Random = random) -> int:
+        j = int(rng.random() * len(self._prob))
+        return j if rng.random() < self._prob[j] else self._alias[j]
+
+
+class WeightedPool:
+    """
+    Indices drawn with probabilities proportional to their weights, of at most 1,
+    which are only computed for the indices proposed.
+
+    Proposals are accepted with a probability of their weight over an upper bound of it: an exact rejection sampling.
+    The indices whose weight is unknown, bounded by 1, are drawn uniformly from an array,
+    which they leave by swapping with its last index, so that drawing, taking and putting back an index are O(1).
+    The indices whose weight was found lower are moved to an alias table over their weights, rebuilt once they,
+    or the proposals of the array rejected, outnumber a batch and the indices of the table, or once half of its mass
+    was taken; this table stays small, since only the questions asked have low weights.
+    """
+    LEARNED_BATCH = 64
+
+    def __init__(self, indices: Iterable[int], weight: Callable[[int], float], rng: random.Random = random):
+        self._weight = weight
+        self._rng = rng
+        self._free = array("I", indices)
+        self._where = {}  # Position in the free array of the indices moved, learned or put back, the others being searched
+        self._learned = {}  # Weight of the free indices found lower than 1
+        self._taken = set()
+        self._proposed = None
+        self._build(array("I"), array("d"))
+
+    def _build(self, indices: array, bounds: array):
+        self._slots = indices
+        self._bounds = bounds
+        self._slot_of = {i: s for s, i in enumerate(indices)}
+        self._table = AliasTable(bounds)
+        self._alive = bytearray(b"\1") * len(indices)
+        self._count = len(indices)
+        self._dead = 0.  # Mass of the slots taken
+        self._rejected = 0  # Proposals of the free array rejected since
+
+    def _rebuild(self):
+        """Moves the learned indices from the free array to a new table of the indices left."""
+        indices = array("I", (i for s, i in enumerate(self._slots) if self._alive[s]))
+        bounds = array("d", (b for s, b in enumerate(self._bounds) if self._alive[s]))
+        for i, weight in list(self._learned.items()):
+            self._remove_free(self._position(i))
+            indices.append(i)
+            bounds.append(weight)
+        self._learned.clear()
+        self._build(indices, bounds)
+
+    def __len__(self) -> int:
+        return len(self._free) + self._count
+
+    @property
+    def mass(self) -> float:
+        """Sum of the bounds of the weights of the indices left."""
+        return len(self._free) + self._table.total - self._dead
+
+    def _position(self, index: int) -> int:
+        k = self._where.get(index)
+        if k is None or k >= len(self._free) or self._free[k] != index:
+            k = self._free.index(index)
+        return k
+
+    def _remove_free(self, k: int):
+        index, last = self._free[k], self._free.pop()
+        if k < len(self._free):
+            self._free[k] = last
+            self._where[last] = k
+        self._where.pop(index, None)
+        self._learned.pop(index, None)
+
+    def _append_free(self, index: int):
+        self._where[index] = len(self._free)
+        self._free.append(index)
+
+    def propose(self) -> int:
+        """Draws an index with a probability proportional to its bound, to accept or not."""
+        if not len(self):
+            raise IndexError("no index left to draw")
+        batch = max(self.LEARNED_BATCH, self._count)
+        if self._learned and max(len(self._learned), self._rejected) > batch or self._dead > self._table.total / 2:
+            self._rebuild()
+        rng = self._rng
+        if self._count and rng.random() * self.mass >= len(self._free):
+            while True:
+                s = self._table.draw(rng)
+                if self._alive[s]:
+                    break
+            self._proposed = self._slots[s], s, None, self._bounds[s]
+        else:
+            k = int(rng.random() * len(self._free))
+            self._proposed = self._free[k], None, k, 1.
+        return self._proposed[0]
+
+    def accept(self, index: int) -> bool:
+        """Accepts the proposed index with a probability of its weight over its bound."""
+        i, s, k, bound = self._proposed
+        if i != index:
+            raise ValueError(f"index {index} was not proposed")
+        weight = self._weight(i)
+        if s is None:
+            if weight < 1:
+                self._learned[i] = weight
+                self._where[i] = k
+        elif weight > bound:  # Outdated bound: draw it again as an unknown one
+            self.take(i)
+            self.put_back(i)
+            return False
+        if self._rng.random() * bound < weight:
+            return True
+        if s is None:
+            self._rejected += 1
+        return False
+
+    def take(self, index: int):
+        """Takes the index out of the pool until put back, in O(1) just after proposing it."""
+        if self._proposed is not None and self._proposed[0] == index:
+            _, s, k, _ = self._proposed
+        elif (s := self._slot_of.get(index)) is not None and self._alive[s]:
+            k = None
+        else:
+            try:
+                s, k = None, self._position(index)
+            except ValueError:
+                raise ValueError(f"index {index} not in pool") from None
+        self._proposed = None
+        if s is None:
+            self._remove_free(k)
+        else:
+            self._alive[s] = 0
+            self._count -= 1
+            self._dead += self._bounds[s]
+            del self._slot_of[index]
+        self._taken.add(index)
+
+    def put_back(self, index: int):
+        """Puts a taken index back, with a weight to compute again."""
+        self._taken.discard(index)
+        self._append_free(index)
+
+    def add(self, index: int):
+        self._append_free(index)
+
+    def discard(self, index: int):
+        """Removes the index for good, whether taken or not."""
+        if index not in self._taken:
+            try:
+                self.take(index)
+            except ValueError:
+                return
+        self._taken.discard(index)
@@ -0,0 +1,151 @@
+"""
+Question banks split into several question files, or shards, e.g. one per theme, author or language.
+
+Every shard is compiled into its own cached bank, in parallel for the outdated ones,
+and the shards are merged into a single sequence of questions.
+Disabling a shard withdraws its questions from the game without parsing any question file again.
+"""
+
+__all__ = ["ShardedQuestionBank"]
+
+import bisect
+import csv
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from millionaire import LANGS
+from millionaire.bank import QuestionBank, load_cached, open_cached
+from millionaire.question import NEUTRAL_LANG, Question, QLevel, QuestionLoader
+from millionaire.watch import QuestionFileWatcher
+
+
+def _compile(path: Path, lang: str) -> str:
+    """Compiles the bank of a question file and returns the report of its parsing."""
+    loader = QuestionLoader(path, lang)
+    load_cached(path, lambda: loader).close()
+    return loader.report()
+
+
+class ShardedQuestionBank(Sequence):
+    """
+    Questions of all the TSV files of a directory, named after their path in it, e.g. 'geography/seas'.
+    The questions are indexed shard after shard, then come those appended while in game.
+    The files of a subdirectory named after a language, e.g. 'en/geography', are in that language by default,
+    the others are language-neutral.
+    """
+
+    def __init__(self, directory: Path, enabled: Iterable[str] = None, jobs: int = None):
+        """All the shards are enabled if none are given."""
+        self._dir = Path(directory)
+        paths = sorted(self._dir.rglob("*.tsv"))
+        parts = [path.relative_to(self._dir).parts for path in paths]
+        self._names = [sys.intern(path.relative_to(self._dir).with_suffix("").as_posix()) for path in paths]
+        langs = [ps[0] if len(ps) > 1 and ps[0] in LANGS else NEUTRAL_LANG for ps in parts]
+
+        banks = [open_cached(*args) for args in zip(paths, self._names)]
+        outdated = [(path, lang) for path, lang, bank in zip(paths, langs, banks) if bank is None]
+        self.reports = []
+        if len(outdated) > 1:
+            with ProcessPoolExecutor(min(jobs or len(outdated), len(outdated))) as pool:
+                self.reports = list(pool.map(_compile, *zip(*outdated)))
+        else:
+            self.reports = [_compile(*args) for args in outdated]
+        self._banks: list[QuestionBank] = [open_cached(path, name) if bank is None else bank
+                                           for path, name, bank in zip(paths, self._names, banks)]
+
+        self._offsets = [0]
+        for bank in self._banks:
+            self._offsets.append(self._offsets[-1] + len(bank))
+        self._watchers = []
+        for path, lang, name, bank in zip(paths, langs, self._names, self._banks):
+            self._watchers.append(QuestionFileWatcher(path, lang, bank.keys, bank.source, name))
+        self._extra = []
+        self._extra_indices = [[] for _ in self._banks]  # Global indices of the questions appended to each shard
+        self._loaders = []
+        self._enabled = set(self._names)
+        if enabled is not None:
+            self._enabled.intersection_update(enabled)
+
+    @property
+    def shards(self) -> list[str]:
+        return list(self._names)
+
+    @property
+    def enabled_shards(self) -> frozenset[str]:
+        return frozenset(self._enabled)
+
+    def enable(self, shard: str, enabled: bool = True):
+        if shard not in self._names:
+            raise KeyError(f"no question shard {shard!r} in {self._dir}")
+        if enabled:
+            self._enabled.add(shard)
+        else:
+            self._enabled.discard(shard)
+
+    def is_enabled(self, index: int) -> bool:
+        return self[index].shard in self._enabled
+
+    def __len__(self) -> int:
+        return self._offsets[-1] + len(self._extra)
+
+    def __getitem__(self, index: int) -> Question:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("question bank index out of range")
+        if index >= self._offsets[-1]:
+            return self._extra[index - self._offsets[-1]]
+        shard = bisect.bisect_right(self._offsets, index) - 1
+        return self._banks[shard][index - self._offsets[shard]]
+
+    def level_indices(self, level: QLevel, lang: str = None) -> array:
+        """Indices of the questions of the enabled shards of the given level and language (any by default)."""
+        indices = array("I")
+        for name, bank, offset in zip(self._names, self._banks, self._offsets):
+            if name in self._enabled:
+                indices.extend(offset + i for i in bank.level_indices(level, lang))
+        offset = self._offsets[-1]
+        indices.extend(offset + i for i, quest in enumerate(self._extra)
+                       if quest.level == level and lang in (None, quest.lang) and quest.shard in self._enabled)
+        return indices
+
+    def append(self, question: Question):
+        """Adds a question in memory only, after the others."""
+        self._extra.append(question)
+
+    def poll(self) -> tuple[list[Question], list[int]] | None:
+        """
+        Returns the questions added to the shards since the last check, to append in this order,
+        and the indices of the questions removed from them, or none if no shard changed.
+        """
+        added, removed = [], []
+        self._loaders = []
+        for shard, watcher in enumerate(self._watchers):
+            try:
+                changes = watcher.poll()
+            except (OSError, csv.Error) as e:  # The file is being written: retry later
+                print(f"{self._names[shard]}: {e}", file=sys.stderr)
+                continue
+            if changes is None:
+                continue
+            self._loaders.append(watcher.loader)
+            new, gone = changes
+            n = len(self._banks[shard])
+            extra = self._extra_indices[shard]
+            removed.extend(self._offsets[shard] + i if i < n else extra[i - n] for i in gone)
+            extra.extend(range(len(self) + len(added), len(self) + len(added) + len(new)))
+            added.extend(new)
+        return (added, removed) if self._loaders else None
+
+    def report(self) -> str:
+        """Report of the last changes parsed."""
+        return "\n".join(loader.report() for loader in self._loaders)
+
+    def close(self):
+        for bank in self._banks:
+            bank.close()
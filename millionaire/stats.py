@@ -0,0 +1,104 @@
+"""
+Statistics of the questions over the games, to favour the questions rarely asked and fairly answered.
+"""
+
+__all__ = ["QuestionStats"]
+
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+from env import QUESTION_STATS_FILE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats (
+    key INTEGER PRIMARY KEY,
+    asked INTEGER NOT NULL DEFAULT 0,
+    answered INTEGER NOT NULL DEFAULT 0,
+    right INTEGER NOT NULL DEFAULT 0,
+    last_asked REAL
+);
+"""
+LOPSIDED_PENALTY = .5  # Weight lost by a question always answered right, or always wrong
+
+
+def _signed(key: int) -> int:
+    """SQLite integers are signed."""
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+class QuestionStats:
+    """
+    Number of times each question was asked and answered right, by question key.
+    The statistics are all held in memory, since only the questions asked have some.
+    """
+
+    def __init__(self, path: Path):
+        self._path = Path(path)
+        self._conn = sqlite3.connect(self._path)
+        self._conn.executescript(SCHEMA)
+        self._data = {key % (1 << 64): [asked, answered, right]
+                      for key, asked, answered, right in self._conn.execute("SELECT key, asked, answered, right FROM stats")}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def times_asked(self) -> int:
+        return sum(asked for asked, _, _ in self._data.values())
+
+    def get(self, key: int) -> tuple[int, int, int]:
+        """Number of times the question was asked, answered, and answered right."""
+        return tuple(self._data.get(key, (0, 0, 0)))
+
+    def weight(self, key: int) -> float:
+        """
+        Weight of the question for a draw, 1 if never asked,
+        divided by the number of times it was asked and lowered if its answers were lopsided.
+        """
+        asked, answered, right = self._data.get(key, (0, 0, 0))
+        rate = (right + 1) / (answered + 2)  # Smoothed, a single answer does not make it lopsided
+        return (1 - LOPSIDED_PENALTY * abs(2 * rate - 1)) / (1 + asked)
+
+    def record_asked(self, key: int):
+        self._data.setdefault(key, [0, 0, 0])[0] += 1
+        with self._conn:
+            self._conn.execute("INSERT INTO stats (key, asked, last_asked) VALUES (?, 1, ?) "
+                               "ON CONFLICT (key) DO UPDATE SET asked = asked + 1, last_asked = excluded.last_asked",
+                               (_signed(key), time.time()))
+
+    def record_answer(self, key: int, right: bool):
+        stats = self._data.setdefault(key, [0, 0, 0])
+        stats[1] += 1
+        stats[2] += right
+        with self._conn:
+            self._conn.execute("INSERT INTO stats (key, answered, right) VALUES (?, 1, ?) "
+                               "ON CONFLICT (key) DO UPDATE SET answered = answered + 1, right = right + excluded.right",
+                               (_signed(key), int(right)))
+
+    def clear(self):
+        self._data.clear()
+        with self._conn:
+            self._conn.execute("DELETE FROM stats")
+
+    def close(self):
+        self._conn.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="manage the statistics of the questions")
+    parser.add_argument("-d", "--database", type=Path, default=QUESTION_STATS_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("summary", help="summarize the statistics")
+    commands.add_parser("reset", help="forget all the statistics")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    stats = QuestionStats(args.database)
+    if args.command == "reset":
+        stats.clear()
+    print(f"{len(stats)} questions asked {stats.times_asked} times", args.database, sep=": ")
+    stats.close()
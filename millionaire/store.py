@@ -0,0 +1,240 @@
+"""
+SQLite question store, to share one large question bank and query subsets of it.
+
+The questions are unique by key, so that importing a question file again only adds its new questions,
+and they are drawn in SQL, without loading the ids of a whole subset.
+"""
+
+__all__ = ["QuestionStore", "StorePool"]
+
+import argparse
+import datetime as dt
+import random
+import sqlite3
+import time
+from array import array
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from env import QUESTION_FILE, QUESTION_DB_FILE
+from millionaire.question import Question, QLevel, QuestionLoader
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id INTEGER PRIMARY KEY,
+    key INTEGER NOT NULL UNIQUE,
+    level INTEGER NOT NULL,
+    question TEXT NOT NULL,
+    right_answer TEXT NOT NULL,
+    wrong_answer_1 TEXT NOT NULL,
+    wrong_answer_2 TEXT NOT NULL,
+    wrong_answer_3 TEXT NOT NULL,
+    author TEXT NOT NULL DEFAULT '',
+    note TEXT NOT NULL DEFAULT '',
+    lang TEXT NOT NULL,
+    publishing_date TEXT
+);
+CREATE INDEX IF NOT EXISTS questions_level ON questions (level, lang, publishing_date);
+CREATE INDEX IF NOT EXISTS questions_lang ON questions (lang);
+CREATE INDEX IF NOT EXISTS questions_author ON questions (author);
+CREATE INDEX IF NOT EXISTS questions_publishing_date ON questions (publishing_date);
+"""
+VERSION = 2
+COLUMNS = ("level", "question", "right_answer", "wrong_answer_1", "wrong_answer_2", "wrong_answer_3",
+           "author", "note", "lang", "publishing_date")
+
+
+def _signed(key: int) -> int:
+    """SQLite integers are signed."""
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+class QuestionStore:
+    """
+    Questions of an SQLite database, optionally restricted to a language, an author or a publishing period.
+    Questions are indexed by their id and only built when picked.
+    """
+
+    def __init__(self, path: Path, lang: str = None, author: str = None,
+                 published_after: dt.date = None, published_before: dt.date = None):
+        self._path = Path(path)
+        self._conn = sqlite3.connect(self._path)
+        exists = self._conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'questions'").fetchone()
+        if exists and self._conn.execute("PRAGMA user_version").fetchone()[0] != VERSION:
+            self._conn.close()
+            raise ValueError(f"not a version {VERSION} question store, import the questions again: {self._path}")
+        self._conn.executescript(SCHEMA)
+        self._conn.execute(f"PRAGMA user_version = {VERSION}")
+        clauses, self._params = [], []
+        for clause, value in [("lang = ?", lang), ("author = ?", author),
+                              ("publishing_date >= ?", published_after), ("publishing_date <= ?", published_before)]:
+            if value is not None:
+                clauses.append(clause)
+                self._params.append(value.isoformat() if isinstance(value, dt.date) else value)
+        self._where = "".join(f" AND {clause}" for clause in clauses)
+        self._built = {}
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        query = f"SELECT count(*) FROM questions WHERE 1{self._where}"
+        return self._conn.execute(query, self._params).fetchone()[0]
+
+    def __getitem__(self, id_: int) -> Question:
+        """Builds the question once, so that it keeps its state (e.g. shuffled answers) while in game."""
+        try:
+            return self._built[id_]
+        except KeyError:
+            pass
+        row = self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM questions WHERE id = ?", (id_,)).fetchone()
+        if row is None:
+            raise IndexError(f"no question {id_}")
+        level, *texts, author, note, lang, date = row
+        self._built[id_] = quest = Question(level, *texts, author=author, note=note, lang=lang,
+                                            publishing_date=date and dt.date.fromisoformat(date))
+        return quest
+
+    def _select(self, columns: str, level: QLevel, lang: str = None) -> tuple[str, list]:
+        """Query of the questions of the given level and language (any by default), with its parameters."""
+        query = f"SELECT {columns} FROM questions WHERE level = ?{self._where}"
+        params = [int(level), *self._params]
+        if lang is not None:
+            query += " AND lang = ?"
+            params.append(lang)
+        return query, params
+
+    def level_indices(self, level: QLevel, lang: str = None) -> array:
+        """Ids of the questions of the given level and language (any by default)."""
+        return array("I", (id_ for id_, in self._conn.execute(*self._select("id", level, lang))))
+
+    def count(self, level: QLevel, lang: str = None) -> int:
+        """Number of questions of the given level and language (any by default), counted from the index."""
+        return self._conn.execute(*self._select("count(*)", level, lang)).fetchone()[0]
+
+    def pool(self, level: QLevel, lang: str, weight: Callable[[int], float], rng: random.Random = random,
+             exclude: Iterable[int] = ()) -> "StorePool":
+        """Questions of the given level and language to draw by their weight, but those excluded."""
+        return StorePool(self, level, lang, weight, rng, exclude)
+
+    def insert(self, questions: Iterable[Question]) -> int:
+        """
+        Inserts the questions in a single transaction and returns their number,
+        skipping those already stored, whatever their metadata.
+        """
+        rows = ((_signed(quest.key), int(quest.level), quest.text, quest.right_answer, *quest.wrong_answers,
+                 quest.author, quest.note, quest.lang, quest.publishing_date and quest.publishing_date.isoformat())
+                for quest in questions)
+        columns = ("key", *COLUMNS)
+        query = f"INSERT OR IGNORE INTO questions ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        with self._conn:
+            count = self._conn.executemany(query, rows).rowcount
+        return count
+
+    def close(self):
+        self._conn.close()
+
+
+class StorePool:
+    """
+    Ids of the questions of a store of a level and language, drawn with probabilities proportional to their weights,
+    of at most 1, like a `WeightedPool`, but without loading them.
+
+    A proposal is the id at a random offset of the level index, drawn again if taken,
+    and accepted with a probability of its weight. Only the ids taken are held in memory.
+    """
+
+    def __init__(self, store: QuestionStore, level: QLevel, lang: str, weight: Callable[[int], float],
+                 rng: random.Random = random, exclude: Iterable[int] = ()):
+        self._conn = store._conn
+        self._weight = weight
+        self._rng = rng
+        query, self._params = store._select("id", level, lang)
+        self._query = query + " LIMIT 1 OFFSET ?"
+        self._count = store.count(level, lang)
+        self._in_pool = query + " AND id = ?"
+        self._taken = {i for i in exclude if i in self}
+        self._proposed = None
+
+    def __contains__(self, index: int) -> bool:
+        """Whether the id is of the level and language of the pool, taken or not."""
+        return self._conn.execute(self._in_pool, [*self._params, index]).fetchone() is not None
+
+    def __len__(self) -> int:
+        return self._count - len(self._taken)
+
+    @property
+    def mass(self) -> float:
+        """Upper bound of the sum of the weights of the ids left."""
+        return len(self)
+
+    def propose(self) -> int:
+        """Draws an id uniformly, to accept or not."""
+        if not len(self):
+            raise IndexError("no index left to draw")
+        while True:
+            offset = int(self._rng.random() * self._count)
+            i, = self._conn.execute(self._query, [*self._params, offset]).fetchone()
+            if i not in self._taken:
+                self._proposed = i
+                return i
+
+    def accept(self, index: int) -> bool:
+        """Accepts the proposed id with a probability of its weight."""
+        if index != self._proposed:
+            raise ValueError(f"index {index} was not proposed")
+        return self._rng.random() < self._weight(index)
+
+    def take(self, index: int):
+        if index in self._taken:
+            raise ValueError(f"index {index} not in pool")
+        self._proposed = None
+        self._taken.add(index)
+
+    def put_back(self, index: int):
+        self._taken.discard(index)
+
+    def add(self, index: int):
+        """The store is not changed while in game: the index is already counted."""
+        self._taken.discard(index)
+
+    def discard(self, index: int):
+        """Removes the id for good, whether taken or not."""
+        if index in self:
+            self._taken.add(index)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="manage the SQLite question store")
+    parser.add_argument("-d", "--database", type=Path, default=QUESTION_DB_FILE)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="import the questions of a TSV question file")
+    import_parser.add_argument("input", nargs="?", type=Path, default=QUESTION_FILE)
+    import_parser.add_argument("-e", "--encoding", help="guessed if not given")
+    import_parser.add_argument("-l", "--lang", default="fr")
+
+    count_parser = commands.add_parser("count", help="count the questions per level, for the given filters")
+    count_parser.add_argument("-l", "--lang")
+    count_parser.add_argument("-a", "--author")
+    count_parser.add_argument("--after", dest="published_after", type=dt.date.fromisoformat)
+    count_parser.add_argument("--before", dest="published_before", type=dt.date.fromisoformat)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "import":
+        store = QuestionStore(args.database)
+        loader = QuestionLoader(args.input, args.lang, args.encoding)
+        n = store.insert(loader)
+        print(loader.report())
+        print(f"{n} questions imported", args.database, sep=": ")
+    else:
+        store = QuestionStore(args.database, args.lang, args.author, args.published_after, args.published_before)
+        for lvl in QLevel:
+            start = time.perf_counter()
+            n = store.count(lvl)
+            print(f"{lvl.name.lower()}: {n} questions ({1000 * (time.perf_counter() - start):.1f} ms)")
+    store.close()
@@ -0,0 +1,161 @@
+"""
+Timers of the game, measured on the monotonic clock and driven by a single scheduler.
+"""
+
+__all__ = ["Timer", "TickScheduler"]
+
+import math
+import time
+from collections.abc import Callable
+
+
+class TickScheduler:
+    """
+    Calls back the timers at a given rate from a single event loop callback, only while one of them runs,
+    and wakes up on time for their deadlines.
+    The timers whose state changed since the last frame, or which expired in it, are redrawn once in the next one.
+    """
+
+    def __init__(self, after: Callable[[int, Callable], str], period: int | None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        The period is in milliseconds, and the after function schedules a callback, like `tk.Misc.after`,
+        in milliseconds of the given clock.
+        Without a period, the frames are only run at the deadlines of the timers, e.g. when nothing is displayed.
+        """
+        self._after = after
+        self.clock = clock
+        self._period = period
+        self._timers: list[Timer] = []
+        self._dirty: set[Timer] = set()
+        self._scheduled = False
+        self._due = 0.  # Time of the frame scheduled
+        self._generation = 0  # Of the frame scheduled, the others being superseded
+        self.frames = 0
+
+    def add(self, timer: "Timer"):
+        self._timers.append(timer)
+
+    def wake(self, timer: "Timer" = None):
+        """
+        Schedules a frame if none is, to redraw the given timer or to run the timers,
+        or if the one scheduled waits for a deadline.
+        """
+        if timer is not None:
+            self._dirty.add(timer)
+        if not self._dirty and not any(t.running for t in self._timers):
+            return
+        if not self._scheduled or self._period is None and self._due > self.clock():
+            self._schedule(0)
+
+    def rearm(self):
+        """Schedules the frames again, e.g. once the event loop they were scheduled on was destroyed."""
+        self._scheduled = False
+        self._dirty.update(self._timers)
+        self.wake()
+
+    def _schedule(self, ms: int):
+        ms = max(0, ms)
+        self._scheduled = True
+        self._due = self.clock() + ms / 1000
+        self._generation += 1
+        self._after(ms, lambda generation=self._generation: self._frame(generation))
+
+    def _frame(self, generation: int):
+        if generation != self._generation:  # Superseded by a frame scheduled since
+            return
+        self.frames += 1
+        now = self.clock()
+        expired = [t for t in self._timers if t.running and t.deadline <= now]
+        for timer in expired:
+            timer.expire()
+        self._dirty.update(expired)  # Drawn full
+        for timer in self._timers:
+            if timer.running or timer in self._dirty:
+                timer.on_tick()
+        self._dirty.clear()
+        for timer in expired:  # Still scheduled: the timers they start are run by the next frame below
+            if timer.on_expire is not None:
+                timer.on_expire()
+        self._scheduled = False
+        deadlines = [t.deadline for t in self._timers if t.running]
+        if deadlines:
+            delay = math.ceil(1000 * (min(deadlines) - self.clock()))
+            self._schedule(delay if self._period is None else min(self._period, delay))
+        elif self._dirty:  # Changed by the expiry callbacks
+            self._schedule(0)
+
+
+class Timer:
+    """Countdown which can be paused and resumed exactly, its elapsed time being frozen meanwhile."""
+
+    def __init__(self, scheduler: TickScheduler, on_tick: Callable[[], None],
+                 on_expire: Callable[[], None] = None):
+        self._scheduler = scheduler
+        self.on_tick = on_tick
+        self.on_expire = on_expire
+        self.timeout = 0.
+        self._elapsed = 0.  # Until the last resume
+        self._since = None  # Monotonic time of the last resume, if running
+        scheduler.add(self)
+
+    @property
+    def running(self) -> bool:
+        return self._since is not None
+
+    @property
+    def elapsed(self) -> float:
+        if self._since is None:
+            return self._elapsed
+        return self._elapsed + self._scheduler.clock() - self._since
+
+    @property
+    def deadline(self) -> float:
+        """Monotonic time at which the timer expires, if running."""
+        return self._since + self.timeout - self._elapsed
+
+    @property
+    def progress(self) -> float:
+        return self.progress_of(self.state, self._scheduler.clock())
+
+    @property
+    def state(self) -> tuple[float, float, float | None]:
+        """Timeout, elapsed time until the last resume and monotonic time of the last resume, if running."""
+        return self.timeout, self._elapsed, self._since
+
+    @staticmethod
+    def progress_of(state: tuple[float, float, float | None], now: float = None) -> float:
+        """
+        Progress of a timer from its state at the given time, now by default,
+        e.g. in another process, the monotonic clock being system-wide.
+        """
+        timeout, elapsed, since = state
+        if since is not None:
+            elapsed += (time.monotonic() if now is None else now) - since
+        return min(elapsed / timeout, 1.) if timeout else 0.
+
+    def start(self, timeout: float):
+        self.timeout = timeout
+        self._elapsed = 0.
+        self._since = self._scheduler.clock()
+        self._scheduler.wake(self)
+
+    def pause(self):
+        if self._since is not None:
+            self._elapsed = self.elapsed
+            self._since = None
+            self._scheduler.wake(self)
+
+    def resume(self):
+        if self._since is None:
+            self._since = self._scheduler.clock()
+            self._scheduler.wake(self)
+
+    def reset(self):
+        self._elapsed = 0.
+        self._since = None
+        self._scheduler.wake(self)
+
+    def expire(self):
+        self._elapsed = self.timeout
+        self._since = None
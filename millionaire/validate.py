@@ -0,0 +1,137 @@
+"""
+Validation of large question files before a show.
+
+The file is cut into chunks at line ends, which are checked in parallel
+with the parsing rules of `Question`, and every issue is reported as a JSON line.
+Errors are rows the game would skip, warnings are rows it would accept but which are probably wrong.
+"""
+
+__all__ = ["validate_row", "validate"]
+
+import argparse
+import csv
+import io
+import json
+import mmap
+import multiprocessing
+import os
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+from env import QUESTION_FILE
+from millionaire import LANGS
+from millionaire.question import QLevel, BOMS, parse_date, sniff_encoding
+
+COLUMNS = ("question", "right_answer", "wrong_answer_1", "wrong_answer_2", "wrong_answer_3", "level",
+           "author", "note", "publishing_date", "lang")
+REQUIRED_COLUMNS = 6
+CHUNK_SIZE = 1 << 22
+
+
+def validate_row(row: list[str]) -> Iterator[tuple[str, str, str]]:
+    """Issues of a row of the question file, as their check, severity and message."""
+    if len(row) < REQUIRED_COLUMNS:
+        yield "columns", "error", f"expected at least {REQUIRED_COLUMNS} columns, got {len(row)}"
+    elif len(row) > len(COLUMNS):
+        yield "columns", "warning", f"expected at most {len(COLUMNS)} columns, got {len(row)}"
+    if len(row) > 5:
+        try:
+            QLevel.from_str(row[5])
+        except ValueError:
+            yield "level", "error", f"expected a level from 0 to {len(QLevel) - 1}, got {row[5]!r}"
+    if len(row) > 8 and row[8]:
+        try:
+            parse_date(row[8])
+        except ValueError as e:
+            yield "date", "error", str(e)
+    if len(row) > 9 and row[9] and row[9] not in LANGS:
+        yield "lang", "warning", f"expected a language among {', '.join(LANGS)}, got {row[9]!r}"
+    for column, cell in zip(COLUMNS[:5], row):
+        if not cell.strip():
+            yield "empty_cell", "warning", f"empty {column.replace('_', ' ')}"
+    answers = [cell.strip().casefold() for cell in row[1:5] if cell.strip()]
+    if len(set(answers)) < len(answers):
+        yield "duplicate_answers", "warning", "several answers are the same"
+
+
+def _validate_chunk(args: tuple[Path, str, int, int]) -> tuple[int, int, list[tuple]]:
+    """Number of lines and rows of a chunk, and its issues with their line number from the start of the chunk."""
+    path, encoding, start, stop = args
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    text = io.StringIO(data.decode(encoding, errors="replace"), newline="")
+    reader = csv.reader(text, dialect=csv.excel_tab)
+    line = 1
+    rows, issues = 0, []
+    for row in reader:
+        if any(row):
+            rows += 1
+            issues.extend((line, *issue) for issue in validate_row(row))
+        line = 1 + reader.line_num
+    return line - 1, rows, issues
+
+
+def _chunks(path: Path, encoding: str, chunk_size: int) -> list[tuple[Path, str, int, int]]:
+    """
+    Cuts the file at line ends outside quoted cells, assuming quotes only enclose cells.
+    Files encoded on several bytes per character are not cut.
+    """
+    size = path.stat().st_size
+    without_bom = next((enc for _, with_bom, enc in BOMS if with_bom == encoding), encoding)
+    if size == 0:
+        return [(path, encoding, 0, 0)]
+    if len("\n".encode(without_bom)) > 1:
+        return [(path, encoding, 0, size)]
+    chunks, start = [], 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        counted, quotes = 0, 0
+        stop = chunk_size
+        while stop < size and (stop := data.find(b"\n", stop) + 1):
+            quotes += data[counted:stop].count(b'"')
+            counted = stop
+            if quotes % 2 == 0:  # Not inside a quoted cell
+                chunks.append((path, encoding if start == 0 else without_bom, start, stop))
+                start, quotes = stop, 0
+                stop = start + chunk_size
+        chunks.append((path, encoding if start == 0 else without_bom, start, size))
+    return chunks
+
+
+def validate(path: Path, encoding: str = None, jobs: int = None,
+             chunk_size: int = CHUNK_SIZE) -> tuple[int, list[tuple[int, str, str, str]]]:
+    """Returns the number of non-empty rows of a question file and its issues with their line number."""
+    path = Path(path)
+    encoding = sniff_encoding(path) if encoding is None else encoding
+    chunks = _chunks(path, encoding, chunk_size)
+    rows, issues = 0, []
+    offset = 0
+    with multiprocessing.Pool(min(jobs or os.cpu_count(), len(chunks))) as pool:
+        for lines, chunk_rows, chunk_issues in pool.imap(_validate_chunk, chunks):
+            rows += chunk_rows
+            issues.extend((offset + line, *issue) for line, *issue in chunk_issues)
+            offset += lines
+    return rows, issues
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="check a TSV question file and report its invalid rows as JSON lines")
+    parser.add_argument("input", nargs="?", type=Path, default=QUESTION_FILE)
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count(), help="number of processes")
+    parser.add_argument("-e", "--encoding", help="guessed if not given")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    rows, issues = validate(args.input, args.encoding, args.jobs)
+    invalid = {line for line, _, severity, _ in issues if severity == "error"}
+    warnings = sum(severity == "warning" for _, _, severity, _ in issues)
+    for line, check, severity, message in issues:
+        print(json.dumps(dict(line=line, check=check, severity=severity, message=message), ensure_ascii=False))
+    print(f"{args.input}: {rows} rows checked, {len(invalid)} invalid, {warnings} warnings, "
+          f"in {time.perf_counter() - start:.3f} s", file=sys.stderr)
+    sys.exit(1 if invalid else 0)
@@ -0,0 +1,105 @@
+"""
+Live reload of the question file while in game.
+"""
+
+__all__ = ["QuestionFileWatcher"]
+
+import hashlib
+import time
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+
+from millionaire.question import Question, QuestionLoader, BOMS, row_key, sniff_encoding
+
+
+class QuestionFileWatcher:
+    """
+    Watches a question file and parses only the rows appended or changed since the last check.
+    The rows known so far are recognized by their keys, in the order of the questions of the game.
+    """
+    CHUNK_SIZE = 1 << 20
+
+    def __init__(self, path: Path, lang: str, keys: Sequence[int], source: tuple[int, int, bytes] = None,
+                 shard: str = None):
+        self._path = Path(path)
+        self._lang = lang
+        self._shard = shard
+        self._keys = keys
+        self._extra_keys = array("Q")
+        self._removed = set()
+        if source is None:
+            stat = self._path.stat()
+            source = stat.st_size, stat.st_mtime_ns, self._hash(None)[1].digest()
+        self._size, self._mtime, self._digest = source
+        self.loader = None
+
+    def _all_keys(self):
+        yield from self._keys
+        yield from self._extra_keys
+
+    def _hash(self, stop: int | None, newline: bytes = b"\n") -> tuple:
+        """
+        Hashes the file in a single read, returning the hash of the first bytes until stop,
+        the hash of the whole file, the number of newlines before stop and whether stop ends a line.
+        """
+        prefix, lines, ends_line = hashlib.sha256(), 0, True
+        with open(self._path, "rb") as f:
+            remaining = stop or 0
+            while remaining > 0 and (chunk := f.read(min(self.CHUNK_SIZE, remaining))):
+                prefix.update(chunk)
+                lines += chunk.count(newline)
+                ends_line = chunk.endswith(newline)
+                remaining -= len(chunk)
+            whole = prefix.copy()
+            while chunk := f.read(self.CHUNK_SIZE):
+                whole.update(chunk)
+        return prefix, whole, lines, ends_line
+
+    def _diff(self, loader: QuestionLoader) -> tuple[list[Question], list[int]]:
+        """Parses the rows whose keys are unknown, and finds the known rows which disappeared."""
+        known = {}
+        for i, key in enumerate(self._all_keys()):
+            if i not in self._removed:
+                known.setdefault(key, []).append(i)
+        added = []
+        for line, row in loader.rows():
+            if inds := known.get(row_key(row)):
+                inds.pop()
+            elif (quest := loader.parse(line, row)) is not None:
+                added.append(quest)
+        removed = [i for inds in known.values() for i in inds]
+        return added, removed
+
+    def poll(self) -> tuple[list[Question], list[int]] | None:
+        """
+        Returns the new questions, to append to those of the game,
+        and the indices of the questions removed from the file, or none if the file did not change.
+        """
+        try:
+            stat = self._path.stat()
+        except FileNotFoundError:
+            return None
+        if (stat.st_size, stat.st_mtime_ns) == (self._size, self._mtime):
+            return None
+
+        start = time.perf_counter()
+        encoding = sniff_encoding(self._path)
+        newline = "\n".encode(next((enc for _, with_bom, enc in BOMS if with_bom == encoding), encoding))
+        prefix, whole, lines, ends_line = self._hash(self._size, newline)
+        if stat.st_size >= self._size and prefix.digest() == self._digest and ends_line:
+            self.loader = QuestionLoader(self._path, self._lang, encoding, self._size, lines + 1, self._shard)
+            added, removed = list(self.loader), []
+        else:
+            self.loader = QuestionLoader(self._path, self._lang, encoding, shard=self._shard)
+            added, removed = self._diff(self.loader)
+        self.loader.duration = time.perf_counter() - start
+
+        self._extra_keys.extend(self.loader.keys)
+        self._removed.update(removed)
+        self._size, self._mtime, self._digest = stat.st_size, stat.st_mtime_ns, whole.digest()
+        return added, removed
+
+    def report(self) -> str:
+        """Report of the last changes parsed."""
+        return self.loader.report()
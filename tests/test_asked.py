@@ -0,0 +1,74 @@
+import time
+
+import pytest
+
+from millionaire.asked import DAY, AskedBitmap
+
+KEYS = [0, 7, (1 << 40) + 3, (1 << 64) - 1]
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """Current time, set by the tests."""
+    clock = [1_700_000_000.]
+    monkeypatch.setattr(time, "time", lambda: clock[0])
+    return clock
+
+
+def test_added_keys_kept(tmp_path):
+    path = tmp_path / "asked.bin"
+    bitmap = AskedBitmap.create(path, 1 << 16)
+    for key in KEYS:
+        bitmap.add(key)
+    bitmap.close()
+
+    bitmap = AskedBitmap.open(path)
+    try:
+        assert all(key in bitmap for key in KEYS)
+        assert 8 not in bitmap
+        assert bitmap.count() == len(KEYS) and bitmap.expiry is None
+        bitmap.clear()
+        assert not any(key in bitmap for key in KEYS) and bitmap.count() == 0
+    finally:
+        bitmap.close()
+
+
+def test_invalid_file_created_again(tmp_path):
+    path = tmp_path / "asked.bin"
+    path.write_bytes(b"ASKD")
+    with pytest.raises(ValueError, match="version 1"):
+        AskedBitmap(path)
+    bitmap = AskedBitmap.open(path, nbits=1 << 10)
+    try:
+        assert bitmap.count() == 0
+        assert path.stat().st_size == AskedBitmap._size(1, 1 << 10)
+    finally:
+        bitmap.close()
+
+
+def test_keys_expire_with_their_slot(tmp_path, now):
+    bitmap = AskedBitmap.create(tmp_path / "asked.bin", 1 << 16, expiry=8, nslots=8)
+    try:
+        assert bitmap.expiry == 8
+        bitmap.add(1)
+        now[0] += 4 * DAY
+        bitmap.add(2)
+        assert 1 in bitmap and 2 in bitmap
+        now[0] += 5 * DAY  # The slot of the first key expired, not that of the second one
+        assert 1 not in bitmap and 2 in bitmap
+        assert bitmap.count() == 1
+        now[0] += 4 * DAY
+        assert 2 not in bitmap
+    finally:
+        bitmap.close()
+
+
+def test_expired_slot_cleared_when_reused(tmp_path, now):
+    bitmap = AskedBitmap.create(tmp_path / "asked.bin", 1 << 16, expiry=2, nslots=2)
+    try:
+        bitmap.add(1)
+        now[0] += 2 * DAY  # Same slot, next cycle
+        bitmap.add(2)
+        assert 1 not in bitmap and 2 in bitmap
+    finally:
+        bitmap.close()
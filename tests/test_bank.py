@@ -0,0 +1,134 @@
+import datetime as dt
+import struct
+
+import pytest
+
+from millionaire.bank import VERSION, QuestionBank, cache_path, load_cached, open_cached
+from millionaire.question import NEUTRAL_LANG, QLevel, Question, QuestionLoader
+
+ROWS = [
+    ["Dans quel océan se situe la Polynésie ?", "Pacifique", "Atlantique", "Indien", "Arctique", "1", "Marie Leblanc"],
+    ["Quelle est la plus grande mer fermée du monde ?", "Mer Caspienne", "Mer d'Aral", "Mer Rouge", "Mer Morte", "2",
+     "Paul Martin", "C'est un lac, formellement", "2023-05-01"],
+    ["Which sea borders Siberia?", "Kara Sea", "Black Sea", "Red Sea", "Dead Sea", "3", "", "", "", "en"],
+    ["Quelle mer borde Marseille ?", "Méditerranée", "Manche", "Mer du Nord", "Baltique", "1"],
+]
+
+
+def write_tsv(path, rows):
+    path.write_text("".join("\t".join(row) + "\n" for row in rows), encoding="utf-8")
+
+
+def set_version(path, version):
+    with open(path, "r+b") as f:
+        f.seek(struct.calcsize("<4s"))
+        f.write(struct.pack("<H", version))
+
+
+@pytest.fixture
+def tsv(tmp_path):
+    path = tmp_path / "questions.tsv"
+    write_tsv(path, ROWS)
+    return path
+
+
+def test_round_trip(tsv, tmp_path):
+    loader = QuestionLoader(tsv, "fr")
+    questions = list(QuestionLoader(tsv, "fr"))
+    path = tmp_path / "questions.qbank"
+    assert QuestionBank.write(path, loader) == len(ROWS)
+
+    bank = QuestionBank(path)
+    try:
+        assert len(bank) == len(ROWS)
+        for quest, stored in zip(questions, bank):
+            assert stored.text == quest.text
+            assert stored.right_answer == quest.right_answer
+            assert stored.wrong_answers == quest.wrong_answers
+            assert (stored.level, stored.author, stored.note, stored.lang) == (quest.level, quest.author,
+                                                                              quest.note, quest.lang)
+            assert stored.publishing_date == quest.publishing_date
+        assert bank[1].publishing_date == dt.date(2023, 5, 1)
+        assert list(bank.keys) == list(loader.keys)
+        assert sorted(bank.langs) == ["en", "fr"]
+        assert list(bank.level_indices(QLevel.EASY, "fr")) == [0, 3]
+        assert list(bank.level_indices(QLevel.HARD, "en")) == [2]
+        assert list(bank.level_indices(QLevel.EXTREME, "de")) == []
+        assert sorted(bank.level_indices(QLevel.HARD)) == [2]
+    finally:
+        bank.close()
+
+
+def test_questions_without_loader(tmp_path):
+    path = tmp_path / "questions.qbank"
+    QuestionBank.write(path, [Question(QLevel.TRIVIAL, "Q ?", "R", "W1", "W2", "W3")])
+    bank = QuestionBank(path)
+    try:
+        assert bank[0].text == "Q ?" and bank[-1].right_answer == "R"
+        assert list(bank.keys) == [0]
+        extra = Question(QLevel.EASY, "Q2 ?", "R", "W1", "W2", "W3")
+        bank.append(extra)
+        assert len(bank) == 2 and bank[1] is extra
+    finally:
+        bank.close()
+
+
+@pytest.mark.parametrize("version", range(1, VERSION))
+def test_older_versions_rejected(tmp_path, version):
+    path = tmp_path / "questions.qbank"
+    QuestionBank.write(path, [Question(QLevel.TRIVIAL, "Q ?", "R", "W1", "W2", "W3")])
+    set_version(path, version)
+    with pytest.raises(ValueError, match=f"version {VERSION}"):
+        QuestionBank(path)
+
+
+def test_truncated_rejected(tmp_path):
+    path = tmp_path / "questions.qbank"
+    QuestionBank.write(path, [Question(QLevel.TRIVIAL, "Q ?", "R", "W1", "W2", "W3")])
+    with open(path, "r+b") as f:
+        f.truncate(path.stat().st_size - 1)
+    with pytest.raises(ValueError, match="truncated"):
+        QuestionBank(path)
+    path.write_bytes(b"QBNK")
+    with pytest.raises(ValueError):
+        QuestionBank(path)
+
+
+@pytest.mark.parametrize("version", range(1, VERSION))
+def test_cache_compiled_again_from_older_versions(tsv, version):
+    bank = load_cached(tsv, lambda: QuestionLoader(tsv, "fr"))
+    bank.close()
+    set_version(cache_path(tsv), version)
+    assert open_cached(tsv) is None
+
+    parsed = []
+    bank = load_cached(tsv, lambda: parsed.append(1) or QuestionLoader(tsv, "fr"))
+    try:
+        assert parsed and len(bank) == len(ROWS)
+        assert struct.unpack_from("<4sH", cache_path(tsv).read_bytes()) == (b"QBNK", VERSION)
+    finally:
+        bank.close()
+
+
+def test_cache_reused(tsv):
+    bank = load_cached(tsv, lambda: QuestionLoader(tsv, NEUTRAL_LANG))
+    bank.close()
+    bank = load_cached(tsv, lambda: pytest.fail("parsed again"))
+    try:
+        assert sorted(bank.langs) == [NEUTRAL_LANG, "en"]
+        assert list(bank.level_indices(QLevel.EASY, NEUTRAL_LANG)) == [0, 3]
+    finally:
+        bank.close()
+
+
+def test_cache_touched_or_changed(tsv):
+    bank = load_cached(tsv, lambda: QuestionLoader(tsv, "fr"))
+    bank.close()
+    stat = tsv.stat()
+    tsv.touch()
+    bank = open_cached(tsv)
+    assert bank is not None and bank.source[:2] == (stat.st_size, tsv.stat().st_mtime_ns)
+    bank.close()
+
+    write_tsv(tsv, ROWS[::-1])  # Same size, other content
+    assert open_cached(tsv) is None
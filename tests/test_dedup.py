@@ -0,0 +1,46 @@
+from array import array
+
+from millionaire.dedup import find_duplicates, normalize, question_text, signature, similarity
+from millionaire.question import QLevel, Question
+
+TEXTS = [
+    "Dans quel océan se situe la Polynésie française ? Pacifique Atlantique Indien Arctique",
+    "Quelle est la plus grande mer fermée du monde ? Mer Caspienne Mer d'Aral Mer Rouge Mer Morte",
+    "Dans quel ocean se situe la Polynesie francaise ? Pacifique, Atlantique, Indien, Arctique !",
+    "Quel peintre a réalisé La Joconde ? Léonard de Vinci Michel-Ange Raphaël Botticelli",
+    "Dans quel océan se trouve la Polynésie française ? Pacifique Atlantique Indien Arctique",
+]
+
+
+def ints(sig):
+    return array("I", sig)
+
+
+def test_normalized():
+    assert normalize("L'Océan  PACIFIQUE, évidemment !") == "l ocean pacifique evidemment"
+
+
+def test_answers_in_any_order():
+    quest = Question(QLevel.EASY, "Q ?", "R", "W1", "W2", "W3")
+    mixed = Question(QLevel.EASY, "Q ?", "R", "W3", "W1", "W2")
+    assert question_text(quest) == question_text(mixed)
+
+
+def test_similarity_estimated():
+    sigs = [ints(signature(text)) for text in TEXTS]
+    assert similarity(sigs[0], sigs[2]) == 1.
+    assert similarity(sigs[0], sigs[4]) > .7
+    assert similarity(sigs[0], sigs[1]) < .3
+    assert len(signature("")) == len(signature("Mer")) == len(sigs[0]) * 4
+
+
+def test_clusters():
+    clusters = find_duplicates(TEXTS * 2 + ["Mer"], jobs=1, chunk_size=3)
+    assert [[i for i, _ in cluster] for cluster in clusters] == [[0, 2, 4, 5, 7, 9], [1, 6], [3, 8]]
+    for cluster in clusters:
+        assert cluster[0][1] == 1.
+        assert all(sim >= .7 for _, sim in cluster)
+
+
+def test_no_duplicates():
+    assert find_duplicates(TEXTS[:2] + TEXTS[3:4], jobs=1) == []
@@ -0,0 +1,66 @@
+import codecs
+import datetime as dt
+
+import pytest
+
+from millionaire.question import QLevel, QuestionLoader, row_key, sniff_encoding
+
+ROWS = [
+    ["Dans quel océan se situe la Polynésie ?", "Pacifique", "Atlantique", "Indien", "Arctique", "1", "Marie Leblanc"],
+    ["Quelle est la plus grande mer fermée du monde ?", "Mer Caspienne", "Mer d'Aral", "Mer Rouge", "Mer Morte", "2",
+     "", "", "2023-05-01", "en"],
+    ["Quelle mer borde Marseille ?", "Méditerranée", "Manche", "Mer du Nord", "Baltique", "1"],
+]
+
+
+def tsv_text(rows):
+    return "".join("\t".join(row) + "\n" for row in rows)
+
+
+@pytest.mark.parametrize("encoding, sniffed", [
+    ("utf-8", "utf-8"), ("utf-8-sig", "utf-8-sig"), ("utf-16", "utf-16"),
+    ("utf-16-le", "utf-16-le"), ("utf-16-be", "utf-16-be"), ("latin-1", "latin-1"),
+])
+def test_encoding_sniffed(tmp_path, encoding, sniffed):
+    path = tmp_path / "questions.tsv"
+    path.write_text(tsv_text(ROWS), encoding=encoding)
+    assert sniff_encoding(path) == sniffed
+    assert [quest.text for quest in QuestionLoader(path)] == [row[0] for row in ROWS]
+
+
+def test_utf8_cut_in_the_middle_of_a_character(tmp_path):
+    path = tmp_path / "questions.tsv"
+    text = "é" * 10
+    path.write_bytes(text.encode("utf-8"))
+    assert sniff_encoding(path, size=5) == "utf-8"
+    path.write_bytes(codecs.BOM_UTF32_LE + text.encode("utf-32-le"))
+    assert sniff_encoding(path) == "utf-32"
+
+
+def test_single_pass_with_row_errors(tmp_path):
+    path = tmp_path / "questions.tsv"
+    rows = [ROWS[0], ["Question sans réponses ?", "R"], [], ROWS[1], ROWS[2][:5] + ["9"], ROWS[2]]
+    path.write_text(tsv_text(rows), encoding="utf-8")
+    loader = QuestionLoader(path, "fr")
+    questions = list(loader)
+
+    assert [quest.text for quest in questions] == [row[0] for row in ROWS]
+    assert [error.line for error in loader.errors] == [2, 5]
+    assert list(loader.lines) == [1, 4, 6]
+    assert list(loader.keys) == [row_key(row) for row in ROWS]
+    assert loader.count == len(ROWS)
+    assert "3 questions parsed (utf-8), 2 invalid rows skipped" in loader.report()
+
+    first, second, third = questions
+    assert (first.level, first.author, first.lang) == (QLevel.EASY, "Marie Leblanc", "fr")
+    assert (second.lang, second.publishing_date) == ("en", dt.date(2023, 5, 1))
+    assert third.author == "" and third.publishing_date is None
+
+
+def test_loaded_from_an_offset(tmp_path):
+    path = tmp_path / "questions.tsv"
+    path.write_text(tsv_text(ROWS), encoding="utf-16")
+    head = len(tsv_text(ROWS[:2]).encode("utf-16"))
+    loader = QuestionLoader(path, encoding="utf-16", start=head, first_line=3)
+    assert [quest.text for quest in loader] == [ROWS[2][0]]
+    assert list(loader.lines) == [3]
@@ -0,0 +1,112 @@
+import random
+from array import array
+from collections import Counter
+
+import pytest
+
+from millionaire.sampling import AliasTable, WeightedPool
+
+
+def draw(pool, n):
+    """Draws and takes n indices, as the game picks its questions."""
+    taken = []
+    while len(taken) < n:
+        i = pool.propose()
+        if pool.accept(i):
+            pool.take(i)
+            taken.append(i)
+    return taken
+
+
+def test_alias_table_frequencies():
+    rng = random.Random(0)
+    table = AliasTable([1., 3., 0., 4.])
+    counts = Counter(table.draw(rng) for _ in range(80000))
+    assert counts[2] == 0
+    for i, weight in [(0, 1.), (1, 3.), (3, 4.)]:
+        assert counts[i] / 80000 == pytest.approx(weight / 8, abs=0.01)
+
+
+def test_take_and_put_back_counts():
+    pool = WeightedPool(range(100), lambda i: 1., random.Random(0))
+    taken = draw(pool, 30)
+    assert len(set(taken)) == 30
+    assert len(pool) == 70 and pool.mass == pytest.approx(70)
+    for i in taken[:10]:
+        pool.put_back(i)
+    assert len(pool) == 80
+    with pytest.raises(ValueError):
+        pool.take(taken[-1])
+    assert set(draw(pool, 80)) == set(range(100)) - set(taken[10:])
+    with pytest.raises(IndexError):
+        pool.propose()
+
+
+def test_accept_checks_the_proposal():
+    pool = WeightedPool(range(10), lambda i: 1., random.Random(0))
+    i = pool.propose()
+    with pytest.raises(ValueError):
+        pool.accept((i + 1) % 10)
+
+
+def test_weighted_counts_with_learned_indices():
+    weights = [1. if i % 4 else .25 for i in range(400)]
+    rng = random.Random(1)
+    counts = Counter()
+    for _ in range(300):
+        pool = WeightedPool(range(400), weights.__getitem__, rng)
+        counts.update(i % 4 == 0 for i in draw(pool, 20))
+    # Light indices hold 100 * 0.25 of a mass of 325
+    assert counts[True] / counts.total() == pytest.approx(25 / 325, abs=0.02)
+
+
+class SearchCountingArray(array):
+    searches = 0
+
+    def index(self, *args):
+        self.searches += 1
+        return array.index(self, *args)
+
+
+def test_learned_indices_never_searched():
+    pool = WeightedPool(range(20000), lambda i: .5 if i % 2 else 1., random.Random(2))
+    pool._free = SearchCountingArray("I", pool._free)
+    taken = draw(pool, 2000)
+    assert pool._free.searches == 0
+    assert len(pool) == 20000 - len(taken)
+    assert not set(taken) & set(draw(pool, len(pool)))
+
+
+def test_outdated_bound_drawn_again():
+    weights = [.1] * 50
+    pool = WeightedPool(range(50), weights.__getitem__, random.Random(3))
+    for _ in range(200):  # Learn the low weights, then rebuild the table
+        i = pool.propose()
+        pool.accept(i)
+    pool._rebuild()
+    weights[:] = [1.] * 50
+    assert sorted(draw(pool, 50)) == list(range(50))
+
+
+def test_add_and_discard():
+    pool = WeightedPool(range(5), lambda i: 1., random.Random(4))
+    pool.add(5)
+    pool.discard(0)
+    pool.discard(42)
+    i = draw(pool, 1)[0]
+    pool.discard(i)
+    assert len(pool) == 4
+    assert set(draw(pool, 4)) == {1, 2, 3, 4, 5} - {i}
+
+
+def test_small_pool_of_low_weights_moved_to_the_table():
+    pool = WeightedPool(range(20), lambda i: .01, random.Random(5))
+    proposals = 0
+    taken = []
+    while len(taken) < 10:
+        i = pool.propose()
+        proposals += 1
+        if pool.accept(i):
+            pool.take(i)
+            taken.append(i)
+    assert proposals < 300  # About 100 per draw while bounded by 1
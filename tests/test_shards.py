@@ -0,0 +1,87 @@
+import os
+
+import pytest
+
+from millionaire import shards
+from millionaire.question import NEUTRAL_LANG, QLevel
+from millionaire.shards import ShardedQuestionBank
+
+SHARDS = {
+    "geographie/mers.tsv": [
+        ["Quelle mer borde Marseille ?", "Méditerranée", "Manche", "Mer du Nord", "Baltique", "1"],
+        ["Quelle est la plus grande mer fermée du monde ?", "Mer Caspienne", "Mer d'Aral", "Mer Rouge", "Mer Morte",
+         "2", "", "", "", "fr"],
+    ],
+    "cinema.tsv": [
+        ["Qui a réalisé Les Quatre Cents Coups ?", "François Truffaut", "Jean-Luc Godard", "Éric Rohmer",
+         "Agnès Varda", "2", "Paul Martin"],
+    ],
+    "en/geography.tsv": [
+        ["Which sea borders Siberia?", "Kara Sea", "Black Sea", "Red Sea", "Dead Sea", "2"],
+    ],
+}
+
+
+def tsv_text(rows):
+    return "".join("\t".join(row) + "\n" for row in rows)
+
+
+@pytest.fixture
+def directory(tmp_path):
+    for name, rows in SHARDS.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(tsv_text(rows), encoding="utf-8")
+    return tmp_path
+
+
+def texts(bank, level, lang=None):
+    return sorted(bank[i].text for i in bank.level_indices(level, lang))
+
+
+def test_merged_with_their_provenance(directory):
+    bank = ShardedQuestionBank(directory, jobs=2)
+    try:
+        assert bank.shards == ["cinema", "en/geography", "geographie/mers"]
+        assert len(bank) == 4 and len(bank.reports) == 3
+        assert [quest.shard for quest in bank] == ["cinema", "en/geography", "geographie/mers", "geographie/mers"]
+        assert [quest.lang for quest in bank] == [NEUTRAL_LANG, "en", NEUTRAL_LANG, "fr"]
+        assert texts(bank, QLevel.MEDIUM, "en") == ["Which sea borders Siberia?"]
+        assert len(bank.level_indices(QLevel.MEDIUM)) == 3
+    finally:
+        bank.close()
+
+
+def test_shards_enabled_without_parsing(directory, monkeypatch):
+    ShardedQuestionBank(directory).close()
+    monkeypatch.setattr(shards, "_compile", lambda *args: pytest.fail("parsed again"))
+    bank = ShardedQuestionBank(directory, enabled=["cinema", "geographie/unknown"])
+    try:
+        assert bank.reports == [] and bank.enabled_shards == {"cinema"}
+        assert texts(bank, QLevel.MEDIUM) == ["Qui a réalisé Les Quatre Cents Coups ?"]
+        bank.enable("geographie/mers")
+        assert texts(bank, QLevel.EASY) == ["Quelle mer borde Marseille ?"]
+        bank.enable("cinema", False)
+        assert len(texts(bank, QLevel.MEDIUM)) == 1 and not bank.is_enabled(0)
+        with pytest.raises(KeyError):
+            bank.enable("histoire")
+    finally:
+        bank.close()
+
+
+def test_changed_shard_polled(directory):
+    bank = ShardedQuestionBank(directory)
+    try:
+        assert bank.poll() is None
+        path = directory / "cinema.tsv"
+        added = ["Qui a réalisé Playtime ?", "Jacques Tati", "Pierre Étaix", "Jean Renoir", "Louis Malle", "3"]
+        path.write_text(tsv_text(SHARDS["cinema.tsv"] + [added]), encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        new, removed = bank.poll()
+        assert [quest.text for quest in new] == [added[0]] and removed == []
+        for quest in new:
+            bank.append(quest)
+        assert bank[-1].shard == "cinema" and texts(bank, QLevel.HARD) == [added[0]]
+    finally:
+        bank.close()
@@ -0,0 +1,115 @@
+import datetime as dt
+import random
+import sqlite3
+
+import pytest
+
+from millionaire.question import QLevel, Question
+from millionaire.store import QuestionStore
+
+QUESTIONS = [
+    Question(QLevel.EASY, "Dans quel océan se situe la Polynésie ?", "Pacifique", "Atlantique", "Indien", "Arctique",
+             author="Marie Leblanc", publishing_date="2022-03-01"),
+    Question(QLevel.MEDIUM, "Quelle est la plus grande mer fermée du monde ?", "Mer Caspienne", "Mer d'Aral",
+             "Mer Rouge", "Mer Morte", publishing_date="2023-05-01"),
+    Question(QLevel.HARD, "Which sea borders Siberia?", "Kara Sea", "Black Sea", "Red Sea", "Dead Sea", lang="en"),
+    Question(QLevel.EASY, "Quelle mer borde Marseille ?", "Méditerranée", "Manche", "Mer du Nord", "Baltique",
+             author="Marie Leblanc"),
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "questions.sqlite"
+    store = QuestionStore(path)
+    store.insert(QUESTIONS)
+    store.close()
+    return path
+
+
+def draw(pool, n):
+    taken = []
+    while len(taken) < n:
+        i = pool.propose()
+        if pool.accept(i):
+            pool.take(i)
+            taken.append(i)
+    return taken
+
+
+def test_imported_once(path):
+    store = QuestionStore(path)
+    try:
+        assert store.insert(QUESTIONS[::-1]) == 0
+        # Same question and answers, other metadata
+        first = QUESTIONS[0]
+        assert store.insert([Question(QLevel.HARD, first.text, first.right_answer, *first.wrong_answers,
+                                      author="Paul Martin")]) == 0
+        assert len(store) == len(QUESTIONS)
+    finally:
+        store.close()
+
+
+def test_filtered_queries(path):
+    store = QuestionStore(path, author="Marie Leblanc")
+    try:
+        assert len(store) == 2
+        assert store.count(QLevel.EASY) == 2 and store.count(QLevel.EASY, "en") == 0
+        dates = {store[i].text: store[i].publishing_date for i in store.level_indices(QLevel.EASY)}
+        assert dates == {QUESTIONS[0].text: dt.date(2022, 3, 1), QUESTIONS[3].text: None}
+    finally:
+        store.close()
+    store = QuestionStore(path, published_after=dt.date(2023, 1, 1))
+    try:
+        assert [store[i].text for lvl in QLevel for i in store.level_indices(lvl)] == [QUESTIONS[1].text]
+    finally:
+        store.close()
+    with pytest.raises(IndexError):
+        QuestionStore(path)[42]
+
+
+def test_older_schema_rejected(tmp_path):
+    path = tmp_path / "questions.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE questions (id INTEGER PRIMARY KEY, level INTEGER NOT NULL)")
+    conn.close()
+    with pytest.raises(ValueError, match="import the questions again"):
+        QuestionStore(path)
+
+
+def test_pool_drawn_in_sql(path):
+    store = QuestionStore(path)
+    try:
+        easy = sorted(store.level_indices(QLevel.EASY, "fr"))
+        pool = store.pool(QLevel.EASY, "fr", lambda i: 1., random.Random(0), exclude=[easy[0], 42])
+        assert len(pool) == 1 and pool.mass == 1
+        assert draw(pool, 1) == [easy[1]]
+        with pytest.raises(IndexError):
+            pool.propose()
+        pool.put_back(easy[1])
+        pool.discard(42)
+        assert len(pool) == 1
+
+        pool = store.pool(QLevel.EASY, "fr", lambda i: 1., random.Random(0))
+        i = pool.propose()
+        with pytest.raises(ValueError):
+            pool.accept(easy[0] + easy[1] - i)
+        assert sorted(draw(pool, 2)) == easy
+    finally:
+        store.close()
+
+
+def test_pool_weighted():
+    store = QuestionStore(":memory:")
+    try:
+        store.insert(Question(QLevel.EASY, f"Q{n} ?", "R", "W1", "W2", "W3") for n in range(100))
+        ids = store.level_indices(QLevel.EASY)
+        light = set(ids[:50])
+        rng = random.Random(1)
+        picked = 0
+        for _ in range(400):
+            pool = store.pool(QLevel.EASY, "fr", lambda i: .25 if i in light else 1., rng)
+            picked += draw(pool, 1)[0] in light
+        assert picked / 400 == pytest.approx(.2, abs=.06)  # 50 * 0.25 of a mass of 62.5
+    finally:
+        store.close()
@@ -0,0 +1,89 @@
+import pytest
+
+from millionaire.display.headless import VirtualClock
+from millionaire.timer import TickScheduler, Timer
+
+PERIOD = 33
+
+
+def scheduler(clock, period=PERIOD):
+    return TickScheduler(clock.after, period, clock)
+
+
+def recording_timer(ticks, on_expire=None):
+    progress = []
+    timer = Timer(ticks, lambda: progress.append(timer.progress), on_expire)
+    return timer, progress
+
+
+@pytest.fixture
+def clock():
+    return VirtualClock()
+
+
+def test_runs_at_the_frame_rate_only_while_running(clock):
+    ticks = scheduler(clock)
+    timer, progress = recording_timer(ticks)
+    timer.start(10)
+    clock.advance(1)
+    assert ticks.frames == pytest.approx(1000 / PERIOD, abs=2)
+    timer.pause()
+    frames = ticks.frames
+    clock.advance(5)
+    assert ticks.frames == frames + 1  # Redrawn once paused
+    assert timer.elapsed == pytest.approx(1, abs=PERIOD / 1000)
+
+
+def test_expired_timer_drawn_full(clock):
+    ticks = scheduler(clock)
+    expired = []
+    timer, progress = recording_timer(ticks, lambda: expired.append(clock()))
+    timer.start(2)
+    clock.advance(3)
+    assert expired == [pytest.approx(2, abs=.001)]
+    assert progress[-1] == 1. and not timer.running
+    assert all(p < 1 for p in progress[:-1])
+
+
+def test_expiry_callback_starting_a_timer_keeps_one_frame_chain(clock):
+    ticks = scheduler(clock)
+    question, _ = recording_timer(ticks)
+    joker, _ = recording_timer(ticks, question.resume)
+    question.start(180)
+    clock.advance(10)
+    question.pause()
+    joker.start(30)
+    clock.advance(31)
+    assert question.running and not joker.running
+    frames = ticks.frames
+    clock.advance(1)
+    assert ticks.frames - frames == pytest.approx(1000 / PERIOD, abs=2)
+
+
+def test_pause_and_resume_exactly(clock):
+    ticks = scheduler(clock)
+    timer, _ = recording_timer(ticks)
+    timer.start(180)
+    clock.advance(100)
+    timer.pause()
+    clock.advance(1000)
+    timer.resume()
+    assert timer.progress == pytest.approx(100 / 180, abs=.001)
+    clock.advance(100)
+    assert not timer.running and timer.elapsed == 180
+
+
+def test_without_period_frames_only_at_deadlines(clock):
+    ticks = scheduler(clock, None)
+    question, question_progress = recording_timer(ticks)
+    expired = []
+    joker, _ = recording_timer(ticks, lambda: (expired.append(clock()), question.resume()))
+    question.start(180)
+    clock.advance(10)
+    question.pause()  # Its frame stays scheduled for its former deadline
+    joker.start(30)
+    clock.advance(40)
+    assert expired == [pytest.approx(40, abs=.001)]
+    clock.advance(200)
+    assert question_progress[-1] == 1. and not question.running
+    assert ticks.frames < 10
@@ -0,0 +1,59 @@
+import pytest
+
+from millionaire.question import QuestionLoader
+from millionaire.validate import validate, validate_row
+
+VALID = ["Quelle mer borde Marseille ?", "Méditerranée", "Manche", "Mer du Nord", "Baltique", "1"]
+ROWS = [
+    VALID,
+    VALID[:5],
+    VALID[:5] + ["7"],
+    VALID + ["", "", "31/02/2023"],
+    VALID + ["", "", "", "de"],
+    ["Quelle mer borde Brest ?", "Mer d'Iroise", "mer d'iroise", " ", "Mer Jaune", "3"],
+    VALID + [""] * 5,
+]
+
+
+def checks(row):
+    return [(check, severity) for check, severity, _ in validate_row(row)]
+
+
+def tsv_text(rows):
+    return "".join("\t".join(row) + "\n" for row in rows)
+
+
+def test_row_checks():
+    assert checks(VALID) == []
+    assert checks(VALID + ["Marie Leblanc", "", "2023-05-01", "en"]) == []
+    assert checks(ROWS[1]) == [("columns", "error")]
+    assert checks(ROWS[2]) == [("level", "error")]
+    assert checks(ROWS[3]) == [("date", "error")]
+    assert checks(ROWS[4]) == [("lang", "warning")]
+    assert checks(ROWS[5]) == [("empty_cell", "warning"), ("duplicate_answers", "warning")]
+    assert checks(ROWS[6]) == [("columns", "warning")]
+
+
+def test_errors_are_the_rows_skipped_by_the_game(tmp_path):
+    path = tmp_path / "questions.tsv"
+    path.write_text(tsv_text(ROWS), encoding="utf-8")
+    loader = QuestionLoader(path)
+    list(loader)
+    _, issues = validate(path, jobs=1)
+    assert sorted({line for line, _, severity, _ in issues if severity == "error"}) == [e.line for e in loader.errors]
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-8-sig", "utf-16"])
+def test_chunks_keep_the_line_numbers(tmp_path, encoding):
+    path = tmp_path / "questions.tsv"
+    rows = [VALID] * 50 + [VALID[:5]] + [['"Quelle mer\nborde Marseille ?"', *VALID[1:]]] * 50 + [VALID[:5]]
+    path.write_text(tsv_text(rows), encoding=encoding)
+    n, issues = validate(path, jobs=2, chunk_size=256)
+    assert n == len(rows)
+    assert [(line, check) for line, check, _, _ in issues] == [(51, "columns"), (152, "columns")]
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / "questions.tsv"
+    path.write_bytes(b"")
+    assert validate(path, jobs=1) == (0, [])
@@ -0,0 +1,95 @@
+import os
+
+import pytest
+
+from millionaire.question import QuestionLoader
+from millionaire.watch import QuestionFileWatcher
+
+ROWS = [
+    ["Dans quel océan se situe la Polynésie ?", "Pacifique", "Atlantique", "Indien", "Arctique", "1"],
+    ["Quelle est la plus grande mer fermée du monde ?", "Mer Caspienne", "Mer d'Aral", "Mer Rouge", "Mer Morte", "2"],
+    ["Quelle mer borde Marseille ?", "Méditerranée", "Manche", "Mer du Nord", "Baltique", "1"],
+]
+NEW_ROW = ["Quelle mer borde Brest ?", "Mer d'Iroise", "Mer Égée", "Mer Noire", "Mer Jaune", "3"]
+
+
+def tsv_text(rows):
+    return "".join("\t".join(row) + "\n" for row in rows)
+
+
+def bump_mtime(path):
+    """Makes sure the change is seen, whatever the resolution of the modification times."""
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+
+@pytest.fixture
+def tsv(tmp_path):
+    path = tmp_path / "questions.tsv"
+    path.write_text(tsv_text(ROWS), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def watcher(tsv):
+    loader = QuestionLoader(tsv, "fr")
+    assert len(list(loader)) == len(ROWS)
+    return QuestionFileWatcher(tsv, "fr", loader.keys)
+
+
+def append(path, rows):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(tsv_text(rows))
+    bump_mtime(path)
+
+
+def test_unchanged(watcher, tsv):
+    assert watcher.poll() is None
+    bump_mtime(tsv)
+    added, removed = watcher.poll()
+    assert added == [] and removed == []
+
+
+def test_append_parses_the_new_rows_only(watcher, tsv):
+    size = tsv.stat().st_size
+    append(tsv, [NEW_ROW])
+    added, removed = watcher.poll()
+    assert [quest.text for quest in added] == [NEW_ROW[0]]
+    assert removed == []
+    assert watcher.loader.start == size
+    assert list(watcher.loader.lines) == [len(ROWS) + 1]
+
+    size = tsv.stat().st_size
+    append(tsv, [ROWS[0]])  # Appended twice: a second question
+    added, removed = watcher.poll()
+    assert [quest.text for quest in added] == [ROWS[0][0]] and removed == []
+    assert watcher.loader.start == size
+
+
+def test_rewrite_diffs_the_rows(watcher, tsv):
+    tsv.write_text(tsv_text([ROWS[2], NEW_ROW, ROWS[0]]), encoding="utf-8")
+    bump_mtime(tsv)
+    added, removed = watcher.poll()
+    assert watcher.loader.start == 0
+    assert [quest.text for quest in added] == [NEW_ROW[0]]
+    assert removed == [1]
+
+    append(tsv, [ROWS[1]])  # Back again, after its removal
+    added, removed = watcher.poll()
+    assert watcher.loader.start > 0
+    assert [quest.text for quest in added] == [ROWS[1][0]] and removed == []
+
+
+def test_rewrite_of_a_line_is_not_an_append(watcher, tsv):
+    rows = [ROWS[0], ROWS[1], [ROWS[2][0].upper(), *ROWS[2][1:]], NEW_ROW]
+    tsv.write_text(tsv_text(rows), encoding="utf-8")
+    bump_mtime(tsv)
+    added, removed = watcher.poll()
+    assert watcher.loader.start == 0
+    assert [quest.text for quest in added] == [rows[2][0], NEW_ROW[0]]
+    assert removed == [2]
+
+
+def test_missing_file(watcher, tsv):
+    tsv.unlink()
+    assert watcher.poll() is None